@@ -6,4 +6,111 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 if not SECRET_KEY:
-    raise ValueError("SECRET_KEY not found in .env")
\ No newline at end of file
+    raise ValueError("SECRET_KEY not found in .env")
+
+# =======================
+# Storage backend
+# =======================
+# "supabase" (PostgREST over HTTP) or "sqlite" (embedded, see app/services/sqlite_backend.py)
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "crm.sqlite3")
+
+# =======================
+# Supabase connection pool
+# =======================
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "100"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "20"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+SUPABASE_READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "30"))
+SUPABASE_POOL_TIMEOUT = float(os.getenv("SUPABASE_POOL_TIMEOUT", "10"))
+
+# =======================
+# Response cache
+# =======================
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+
+# =======================
+# Auth
+# =======================
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(BCRYPT_WORKERS * 8)))
+
+# =======================
+# CSV export / import
+# =======================
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+IMPORT_MAX_IN_FLIGHT = int(os.getenv("IMPORT_MAX_IN_FLIGHT", "4"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# =======================
+# Activity log (write-behind)
+# =======================
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "200"))
+ACTIVITY_FLUSH_INTERVAL_MS = int(os.getenv("ACTIVITY_FLUSH_INTERVAL_MS", "250"))
+ACTIVITY_ENQUEUE_TIMEOUT = float(os.getenv("ACTIVITY_ENQUEUE_TIMEOUT", "1"))
+ACTIVITY_FLUSH_RETRIES = int(os.getenv("ACTIVITY_FLUSH_RETRIES", "3"))
+
+# =======================
+# External lead sync
+# =======================
+SYNC_BATCH_SIZE = int(os.getenv("SYNC_BATCH_SIZE", "1000"))
+# Re-read this far behind the watermark; must exceed the longest transaction writing external rows
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "300"))
+
+# =======================
+# PDF reports
+# =======================
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", "2"))
+PDF_MAX_CONCURRENCY = int(os.getenv("PDF_MAX_CONCURRENCY", str(PDF_WORKERS)))
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "256"))
+PDF_CACHE_TTL = float(os.getenv("PDF_CACHE_TTL", "3600"))
+
+# =======================
+# Query fan-out
+# =======================
+QUERY_BATCH_TIMEOUT = float(os.getenv("QUERY_BATCH_TIMEOUT", "10"))
+
+# =======================
+# Bulk endpoints
+# =======================
+BULK_MAX_OPERATIONS = int(os.getenv("BULK_MAX_OPERATIONS", "5000"))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+# =======================
+# Metrics
+# =======================
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# =======================
+# Request tracing
+# =======================
+# Adds a Server-Timing header with every Supabase round trip; meant for development
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+# Warn when a request makes more round trips than this (0 disables the warning)
+TRACE_ROUND_TRIP_BUDGET = int(os.getenv("TRACE_ROUND_TRIP_BUDGET", "5"))
+TRACE_MAX_TIMINGS = int(os.getenv("TRACE_MAX_TIMINGS", "20"))
+
+# =======================
+# Admission control
+# =======================
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Per-user token bucket keyed by the JWT subject (0 disables it)
+ADMISSION_USER_RATE = float(os.getenv("ADMISSION_USER_RATE", "10"))
+ADMISSION_USER_BURST = float(os.getenv("ADMISSION_USER_BURST", "40"))
+ADMISSION_HEAVY_COST = float(os.getenv("ADMISSION_HEAVY_COST", "10"))
+ADMISSION_CPU_COST = float(os.getenv("ADMISSION_CPU_COST", "5"))
+ADMISSION_MAX_USERS = int(os.getenv("ADMISSION_MAX_USERS", "10000"))
+# Per-worker concurrency caps by route class, each with a short queue
+ADMISSION_LIGHT_CONCURRENCY = int(os.getenv("ADMISSION_LIGHT_CONCURRENCY", "256"))
+ADMISSION_HEAVY_CONCURRENCY = int(os.getenv("ADMISSION_HEAVY_CONCURRENCY", "8"))
+ADMISSION_CPU_CONCURRENCY = int(os.getenv("ADMISSION_CPU_CONCURRENCY", str(2 * (BCRYPT_WORKERS + PDF_MAX_CONCURRENCY))))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_RETRY_AFTER = float(os.getenv("ADMISSION_RETRY_AFTER", "1"))
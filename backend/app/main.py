@@ -3,7 +3,8 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 from app.routes import lead, contact, auth, deals
 from app.routes import reports
 
@@ -12,8 +13,20 @@ from app.routes import contact
 import os
 import logging
 
+from app import config
+
 from app.routes import lead, auth
 from app.routes.dashboard import router as dashboard_router
+from app.services.supabase_client import supabase
+from app.services.cache import response_cache
+from app.services.activity_log import activity_log
+from app.services import pdf_reports, metrics, admission
+from app.utils import passwords
+from app.utils.request_metrics import RequestMetricsMiddleware
+from app.utils.request_admission import AdmissionControlMiddleware
+from app.utils.request_tracing import RequestTracingMiddleware, SERVER_TIMING_HEADER
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.utils.conditional import ETAG_HEADER
 
 
 # =======================
@@ -29,27 +42,92 @@ if not SECRET_KEY:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# =======================
+# App Lifespan
+# =======================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    activity_log.start()
+    yield
+    # Flush queued activities before the pool goes away
+    await activity_log.stop()
+    # Release pooled Supabase connections on shutdown
+    await supabase.aclose()
+    passwords.shutdown()
+    pdf_reports.shutdown()
+
 # =======================
 # FastAPI App Instance
 # =======================
 app = FastAPI(
     title="Advanced CRM System",
     version="0.1.0",
-    description="A modern CRM backend powered by FastAPI and Supabase"
+    description="A modern CRM backend powered by FastAPI and Supabase",
+    lifespan=lifespan
 )
 
+# Added before CORS so it runs inside it and its 429/503 answers keep the CORS headers
+if config.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173","https://crm-system-dq1naligh-dishas-projects-0b3bbeff.vercel.app", "https://crm-system-two-omega.vercel.app" ],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, ETAG_HEADER, SERVER_TIMING_HEADER],
 )
 
+if config.TRACING_ENABLED:
+    app.add_middleware(RequestTracingMiddleware)
+
+# Added last, so it wraps CORS and everything below it
+if config.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 @app.get("/")
 def root():
     return {"message": "Welcome to the CRM Backend!"}
 
 
+# =======================
+# Response Cache Stats
+# =======================
+@app.get("/cache/stats")
+def cache_stats():
+    return response_cache.stats()
+
+
+# =======================
+# Prometheus Metrics
+# =======================
+@metrics.registry.collect
+def _component_stats():
+    for name, cache in (("response", response_cache), ("pdf", pdf_reports.pdf_cache)):
+        stats = cache.stats()
+        metrics.cache_entries.set(name, value=stats["entries"])
+        metrics.cache_lookups.set(name, "hit", value=stats["hits"])
+        metrics.cache_lookups.set(name, "miss", value=stats["misses"])
+        metrics.cache_evictions.set(name, value=stats["evictions"])
+
+    metrics.bcrypt_pending.set(value=passwords.pending())
+
+    log_stats = activity_log.stats()
+    metrics.activity_queue.set(value=log_stats["queued"])
+    for outcome in ("flushed", "dropped", "failed"):
+        metrics.activity_events.set(outcome, value=log_stats[outcome])
+
+    for route_class, gate in admission.gates.items():
+        metrics.admission_in_flight.set(route_class, value=gate.in_flight)
+        metrics.admission_queued.set(route_class, value=gate.queued)
+
+
+if config.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # =======================
 # OAuth2 Security Scheme
 # =======================
@@ -109,7 +187,7 @@ def custom_openapi():
     }
 
     # Apply BearerAuth security to all endpoints except public ones
-    public_paths = ["/", "/auth/signup", "/auth/login"]
+    public_paths = ["/", "/auth/signup", "/auth/login", "/cache/stats"]
     for path in openapi_schema["paths"]:
         for method in openapi_schema["paths"][path]:
             if path not in public_paths:
@@ -0,0 +1,45 @@
+# app/models/bulk.py
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+from app import config
+
+
+# ----------------------------
+# Bulk request (leads / contacts / deals)
+# ----------------------------
+class BulkRequest(BaseModel):
+    """
+    Items are validated one by one against the collection's own models,
+    so a bad item is reported in the results instead of failing the batch.
+    """
+    create: List[dict] = Field(default_factory=list, example=[{"first_name": "Ava", "last_name": "Patel"}])
+    update: List[dict] = Field(default_factory=list, example=[{"id": 1, "status": "qualified"}])
+    delete: List[int] = Field(default_factory=list, example=[7, 8])
+
+    @model_validator(mode="after")
+    def check_size(self):
+        total = len(self.create) + len(self.update) + len(self.delete)
+        if total > config.BULK_MAX_OPERATIONS:
+            raise ValueError(f"At most {config.BULK_MAX_OPERATIONS} operations per request (got {total})")
+        return self
+
+
+# ----------------------------
+# Per-item outcome
+# ----------------------------
+class BulkItemResult(BaseModel):
+    op: str
+    index: int
+    status: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+    errors: Optional[List[dict]] = None
+
+
+class BulkResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    results: List[BulkItemResult] = []
@@ -15,6 +15,11 @@ class ContactBase(BaseModel):
 class ContactCreate(ContactBase):
     pass
 
+# Fields PUT /contacts/{id} and bulk updates may change
+class ContactUpdate(BaseModel):
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+
 class Contact(ContactBase):
     id: Optional[int] = None
     owner_email: Optional[EmailStr] = None
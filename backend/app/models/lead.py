@@ -24,6 +24,20 @@ class LeadCreate(LeadBase):
     """Schema for creating a new lead — excludes ID and owner_email."""
     pass
 
+# ----------------------------
+# Update Lead Schema (all fields optional)
+# ----------------------------
+class LeadUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    company: Optional[str] = None
+    email: Optional[EmailStr] = None
+    phone: Optional[str] = None
+    source: Optional[str] = None
+    status: Optional[str] = None
+    notes: Optional[str] = None
+    owner_email: Optional[EmailStr] = None  # reassign to another owner
+
 # ----------------------------
 # Full Lead Schema (DB Record)
 # ----------------------------
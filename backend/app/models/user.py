@@ -26,3 +26,20 @@ class UserOut(BaseModel):
     model_config = {
         "from_attributes": True
     }
+
+# ----------------------------
+# Authenticated principal (built once per token)
+# ----------------------------
+class Principal(BaseModel):
+    id: int
+    email: str
+    role: Optional[str] = None
+
+    model_config = {
+        "frozen": True
+    }
+
+    @property
+    def is_admin(self) -> bool:
+        # Role names are exact; users without a role are Sales
+        return (self.role or "Sales") == "Admin"
@@ -2,8 +2,9 @@
 from fastapi import APIRouter, HTTPException, Form, Header, Depends
 from fastapi.security import OAuth2PasswordBearer
 from app.services.supabase_client import supabase
-from app.utils.jwt_handler import create_access_token, verify_token
-import bcrypt
+from app.utils.jwt_handler import create_access_token, verify_token, principal_cache
+from app.models.user import Principal
+from app.utils.passwords import hash_password, verify_password, needs_rehash, PasswordHasherBusy
 from fastapi import Body
 
 from fastapi import HTTPException
@@ -12,17 +13,25 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+
+def _hasher_busy():
+    return HTTPException(
+        status_code=503,
+        detail="Too many concurrent password checks, please retry",
+        headers={"Retry-After": "1"}
+    )
+
 @router.post("/signup")
-def signup(email: str = Form(...), password: str = Form(...)):
+async def signup(email: str = Form(...), password: str = Form(...)):
     try:
-        existing_user = supabase.table("users").select("*").eq("email", email).execute()
+        existing_user = await supabase.table("users").select("*").eq("email", email).execute()
         if existing_user.data:
             raise HTTPException(status_code=400, detail="User already exists")
 
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
-        result = supabase.table("users").insert({
+        hashed_password = await hash_password(password)
+        result = await supabase.table("users").insert({
             "email": email,
-            "password": hashed_password.decode("utf-8")
+            "password": hashed_password
         }).execute()
 
         if not result.data:
@@ -30,29 +39,41 @@ def signup(email: str = Form(...), password: str = Form(...)):
 
         return {"message": "User registered successfully"}
 
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     except Exception as e:
         print("❌ Signup Error:", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.post("/login")
-def login(email: str = Form(...), password: str = Form(...)):
+async def login(email: str = Form(...), password: str = Form(...)):
     try:
-        user = supabase.table("users").select("*").eq("email", email).execute()
+        user = await supabase.table("users").select("*").eq("email", email).execute()
         if not user.data:
             raise HTTPException(status_code=400, detail="Invalid email or password")
 
         user_data = user.data[0]
 
-        if not bcrypt.checkpw(password.encode("utf-8"), user_data["password"].encode("utf-8")):
+        if not await verify_password(password, user_data["password"]):
             raise HTTPException(status_code=400, detail="Invalid email or password")
 
-        
+        # Transparently upgrade hashes made with a different work factor
+        if needs_rehash(user_data["password"]):
+            try:
+                await supabase.table("users") \
+                    .update({"password": await hash_password(password)}) \
+                    .eq("id", user_data["id"]) \
+                    .execute()
+            except PasswordHasherBusy:
+                pass  # retried on the next login
+
         token = create_access_token({
              "sub": user_data["email"],
-             "role": user_data["role"],
-             "name": user_data.get("name"),
-             "profile_pic": user_data.get("profile_pic")
+             "uid": user_data["id"],
+             "role": user_data["role"]
         })
         return {
             "access_token": token,
@@ -60,12 +81,16 @@ def login(email: str = Form(...), password: str = Form(...)):
             "role": user_data["role"]
         }
 
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     except Exception as e:
         print("❌ Login Error:", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @router.get("/me")
-def get_me(authorization: str = Header(...)):
+async def get_me(authorization: str = Header(...)):
     try:
         parts = authorization.replace("Bearer", "").strip().split()
         if not parts:
@@ -73,16 +98,16 @@ def get_me(authorization: str = Header(...)):
 
         token = parts[0]
 
-        payload = verify_token(token)
-        if payload is None:
+        principal = await resolve_principal(token)
+        if principal is None:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-       
+        profile = await _profile(principal, "name,profile_pic")
         return {
-                "email": payload.get("sub"),
-                "role": payload.get("role"),
-                "name": payload.get("name"),
-                "profile_pic": payload.get("profile_pic")
+                "email": principal.email,
+                "role": principal.role,
+                "name": profile.get("name"),
+                "profile_pic": profile.get("profile_pic")
                 }
 
     except Exception as e:
@@ -90,39 +115,76 @@ def get_me(authorization: str = Header(...)):
         raise HTTPException(status_code=401, detail="Invalid or missing token")
 
 
-# ✅ Function for dependency injection in other routes
-def get_current_user(token: str = Depends(oauth2_scheme)):
-    print("🔎 Incoming Token:", token)
+async def resolve_principal(token: str):
+    """
+    Turn a bearer token into a Principal, verifying it at most once.
+
+    Tokens issued by /auth/login carry the user id and role, so no lookup
+    is needed. Older tokens without a ``uid`` claim are resolved
+    with a single users query; either way the result is cached until the
+    token's ``exp``.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
 
     payload = verify_token(token)
+    if payload is None or not payload.get("sub"):
+        return None
+
+    user_id = payload.get("uid")
+
+    if user_id is None:
+        user = await (
+            supabase.table("users")
+            .select("id")
+            .eq("email", payload["sub"])
+            .execute()
+        )
+        if not user.data:
+            return None
+        user_id = user.data[0]["id"]
+
+    principal = Principal(
+        id=user_id,
+        email=payload["sub"],
+        role=payload.get("role")
+    )
+    principal_cache.put(token, principal, payload["exp"])
+    return principal
+
 
-    if payload is None:
+# ✅ Function for dependency injection in other routes
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
+    principal = await resolve_principal(token)
+
+    if principal is None:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
-    print("✅ Token Payload:", payload)
+    return principal
 
-    return {
-        "email": payload.get("sub"),
-        "role": payload.get("role")
-    }
-@router.get("/profile")
-def get_profile(current_user: dict = Depends(get_current_user)):
 
-    user = (
-        supabase.table("users")
-        .select("name,email")
-        .eq("email", current_user["email"])
-        .single()
-        .execute()
-    )
+async def _profile(principal: Principal, columns: str) -> dict:
+    # Display fields can change under a live token, so they are read fresh
+    # (a primary-key lookup) rather than trusted from its claims
+    user = await supabase.table("users").select(columns).eq("id", principal.id).execute()
+    return user.data[0] if user.data else {}
 
-    return user.data
+
+@router.get("/profile")
+async def get_profile(current_user: Principal = Depends(get_current_user)):
+
+    profile = await _profile(current_user, "name")
+    return {
+        "name": profile.get("name"),
+        "email": current_user.email
+    }
 
 
 @router.put("/update-profile")
-def update_profile(
+async def update_profile(
     data: dict = Body(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
 
     update_data = {}
@@ -131,18 +193,17 @@ def update_profile(
         update_data["name"] = data["name"]
 
     if data.get("password"):
-        hashed_password = bcrypt.hashpw(
-            data["password"].encode("utf-8"),
-            bcrypt.gensalt()
-        )
-        update_data["password"] = hashed_password.decode("utf-8")
+        try:
+            update_data["password"] = await hash_password(data["password"])
+        except PasswordHasherBusy:
+            raise _hasher_busy()
 
     if not update_data:
         raise HTTPException(status_code=400, detail="Nothing to update")
 
-    supabase.table("users") \
+    await supabase.table("users") \
         .update(update_data) \
-        .eq("email", current_user["email"]) \
+        .eq("email", current_user.email) \
         .execute()
 
     return {"message": "Profile updated successfully"}
\ No newline at end of file
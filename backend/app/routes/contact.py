@@ -1,51 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel
 
 from app.services.supabase_client import supabase
+from app.services.cache import response_cache, owner_tag, CONTACTS
 from app.routes.auth import get_current_user
-from app.models.contact import Contact, ContactCreate
+from app.models.user import Principal
+from app.models.contact import Contact, ContactCreate, ContactUpdate
+from app.models.bulk import BulkRequest, BulkResponse
+from app.services.bulk import BulkWriter
+from app.services.export import open_csv_export
+from app.utils.pagination import apply_cursor, order_by_cursor, next_cursor, NEXT_CURSOR_HEADER
+from app.utils.conditional import conditional_response
+from app.utils.fields import parse_fields, select_clause, FIELDS_DESCRIPTION, LIST_FIELDS_DESCRIPTION
+from app.utils.responses import rows_response
 
 router = APIRouter(prefix="/contacts", tags=["Contacts"])
 
+# CSV columns for export
+EXPORT_COLUMNS = ["first_name", "last_name", "email", "phone", "company", "job_title", "notes", "owner_email", "created"]
+
 class ContactResponse(BaseModel):
     message: str
     contact: Contact
 
 @router.get("/", response_model=List[Contact])
-def get_contacts(
+async def get_contacts(
+    request: Request,
+    response: Response,
     search: Optional[str] = Query(None, description="Search by first name"),
-    limit: int = Query(100, description="Max results"),
-    current_user: dict = Depends(get_current_user)
+    limit: int = Query(100, ge=1, le=1000, description="Max results"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    fields: Optional[str] = Query(None, description=LIST_FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
 ):
-    try:
-        q = supabase.table("contacts").select("*").eq("owner_email", current_user["email"])
+    email = current_user.email
+    columns = parse_fields(fields, Contact.model_fields, always=("id", "created"))
+    cache_key = response_cache.make_key(
+        "contacts.list", email, search=search, limit=limit, cursor=cursor,
+        fields=tuple(columns) if columns else None
+    )
+
+    async def load():
+        q = supabase.table("contacts").select(select_clause(columns)).eq("owner_email", email)
         if search:
             q = q.ilike("first_name", f"%{search}%")
-        res = q.order("created", desc=True).limit(limit).execute()
+        q = order_by_cursor(q)
+        if cursor:
+            q = apply_cursor(q, cursor)
+        res = await q.limit(limit).execute()
         return res.data or []
+
+    tags = [owner_tag(CONTACTS, email)]
+
+    not_modified = conditional_response(request, response, response_cache.etag(cache_key, tags))
+    if not_modified:
+        return not_modified
+
+    try:
+        contacts = await response_cache.get_or_load(cache_key, tags, load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, detail=f"Error fetching contacts: {e}")
 
+    cursor_out = next_cursor(contacts, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    # Rows are our own; skip response_model re-validation (fields= rows are partial)
+    return rows_response(contacts, columns or Contact.model_fields, response)
+
+@router.get("/export")
+async def export_contacts(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
+):
+    columns = parse_fields(fields, EXPORT_COLUMNS, always=()) or EXPORT_COLUMNS
+    try:
+        chunks = await open_csv_export(
+            "contacts",
+            columns,
+            owner_column="owner_email",
+            owner=current_user.email
+        )
+        return StreamingResponse(
+            chunks,
+            media_type="text/csv",
+            headers={"Content-Disposition": "attachment; filename=contacts.csv"}
+        )
+    except Exception as e:
+        raise HTTPException(500, detail=f"Error exporting contacts: {e}")
+
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
-def create_contact(contact: ContactCreate, current_user: dict = Depends(get_current_user)):
+async def create_contact(contact: ContactCreate, current_user: Principal = Depends(get_current_user)):
     data = contact.dict(exclude_unset=True)
-    data["owner_email"] = current_user["email"]
+    data["owner_email"] = current_user.email
     if isinstance(data.get("created"), (date, datetime)):
         data["created"] = data["created"].isoformat()
     try:
-        res = supabase.table("contacts").insert(data).execute()
+        res = await supabase.table("contacts").insert(data).execute()
         new_contact = res.data[0]
+        response_cache.invalidate(owner_tag(CONTACTS, current_user.email))
         return {"message": "Contact created successfully", "contact": new_contact}
     except Exception as e:
         raise HTTPException(500, detail=f"Failed to create contact: {e}")
 
 @router.put("/{contact_id}", response_model=Contact)
-def update_contact(
+async def update_contact(
     contact_id: int,
     payload: dict = Body(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # ✳️ Only allow updating email + phone (you can expand later)
@@ -54,15 +120,16 @@ def update_contact(
         if not update:
             raise HTTPException(400, detail="No allowed fields to update (email, phone).")
 
-        res = (
+        res = await (
             supabase.table("contacts")
             .update(update)
             .eq("id", contact_id)
-            .eq("owner_email", current_user["email"])
+            .eq("owner_email", current_user.email)
             .execute()
         )
         if not res.data:
             raise HTTPException(404, detail="Contact not found or not owned by current user")
+        response_cache.invalidate(owner_tag(CONTACTS, current_user.email))
         return res.data[0]
     except HTTPException:
         raise
@@ -70,17 +137,47 @@ def update_contact(
         raise HTTPException(500, detail=f"Error updating contact: {e}")
 
 @router.delete("/{contact_id}")
-def delete_contact(contact_id: int, current_user: dict = Depends(get_current_user)):
-    existing = supabase.table("contacts").select("*").eq("id", contact_id).execute()
+async def delete_contact(contact_id: int, current_user: Principal = Depends(get_current_user)):
+    existing = await supabase.table("contacts").select("*").eq("id", contact_id).execute()
     if not existing.data:
         raise HTTPException(404, detail="Contact not found")
 
-    user_role = current_user.get("role", "Sales")
-    if user_role != "Admin" and existing.data[0]["owner_email"] != current_user["email"]:
+    if not current_user.is_admin and existing.data[0]["owner_email"] != current_user.email:
         raise HTTPException(403, detail="Not authorized to delete this contact")
 
     try:
-        supabase.table("contacts").delete().eq("id", contact_id).execute()
+        await supabase.table("contacts").delete().eq("id", contact_id).execute()
+        response_cache.invalidate(owner_tag(CONTACTS, existing.data[0]["owner_email"]))
         return {"message": "Contact deleted successfully"}
     except Exception as e:
         raise HTTPException(500, detail=f"Failed to delete contact: {e}")
+
+
+def _bulk_record(contact: ContactCreate, owner_email: str) -> dict:
+    record = contact.model_dump(mode="json")
+    record["owner_email"] = owner_email
+    record["created"] = record["created"] or datetime.utcnow().isoformat()
+    return record
+
+
+def _bulk_changes(contact: ContactUpdate) -> dict:
+    return {k: v for k, v in contact.model_dump(mode="json", exclude_unset=True).items() if v is not None}
+
+
+# Admins may delete any contact (as in DELETE /contacts/{id}); updates are owner-only
+bulk_contacts_writer = BulkWriter(
+    "contacts", "owner_email", ContactCreate, ContactUpdate,
+    to_create=_bulk_record, to_update=_bulk_changes,
+    admin_ops=("delete",)
+)
+
+
+@router.post("/bulk", response_model=BulkResponse, response_model_exclude_none=True)
+async def bulk_contacts(ops: BulkRequest, current_user: Principal = Depends(get_current_user)):
+    summary, changes = await bulk_contacts_writer.run(ops, current_user.email, current_user.is_admin)
+
+    owners = {current_user.email, *changes["previous_owners"]}
+    owners.update(row.get("owner_email") for row in changes["update"] + changes["delete"])
+    response_cache.invalidate(*(owner_tag(CONTACTS, o) for o in owners if o))
+
+    return summary
@@ -1,206 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
 from .auth import get_current_user
+from app.models.user import Principal
 from app.services.supabase_client import supabase
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.platypus import TableStyle
-from reportlab.lib.units import inch
+from app.services.kpis import fetch_dashboard_kpis
+from app.services.lead_sync import sync_source, SYNC_SOURCES
+from app.services.cache import response_cache, owner_tag, LEADS, DEALS, ACTIVITIES
+from app.services.pdf_reports import render_dashboard_report
+from app.utils.conditional import conditional_response
 
-import matplotlib.pyplot as plt
-import os
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Columns the recent-activity feed renders
+ACTIVITY_COLUMNS = "id,type,message,amount,created_at"
 
 
-@router.get("/stats")
-def get_dashboard_stats(current_user=Depends(get_current_user)):
-
-    email = current_user.get("email")
-
-    if not email:
-        raise HTTPException(status_code=400, detail="Invalid user")
-
-    # Get user id safely
-    user_res = supabase.table("users") \
-        .select("id") \
-        .eq("email", email) \
-        .single() \
-        .execute()
-
-    if not user_res.data:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_id = user_res.data["id"]
-
-    # Fetch leads
-    leads_res = supabase.table("leads") \
-        .select("*") \
-        .eq("owner_email", email) \
-        .execute()
-
-    leads = leads_res.data or []
-    total_leads = len(leads)
-
-    active_leads = len([
-        l for l in leads
-        if l.get("status") and l["status"].lower() != "lost"
-    ])
-
-    # Fetch deals
-    deals_res = supabase.table("deals") \
-        .select("*") \
-        .eq("owner_id", user_id) \
-        .execute()
-
-    deals = deals_res.data or []
-
-    # Only won deals
-    won_deals = [
-        d for d in deals
-        if d.get("stage") and d["stage"].lower() == "won"
-    ]
-
-    closed_deals = len(won_deals)
 
-    total_revenue = sum(
-        float(d.get("value", 0))
-        for d in won_deals
-        if d.get("value")
-    )
-
-    conversion_rate = (
-        (closed_deals / total_leads) * 100
-        if total_leads else 0
+@router.get("/stats")
+async def get_dashboard_stats(request: Request, response: Response, current_user: Principal = Depends(get_current_user)):
+
+    email = current_user.email
+    user_id = current_user.id
+
+    async def load():
+        kpis = await fetch_dashboard_kpis(email, user_id)
+
+        return {
+            "total_revenue": kpis["total_revenue"],
+            "active_leads": kpis["active_leads"],
+            "conversion_rate": kpis["conversion_rate"],
+            "closed_deals": kpis["closed_deals"]
+        }
+
+    cache_key = response_cache.make_key("dashboard.stats", email)
+    tags = [owner_tag(LEADS, email), owner_tag(DEALS, user_id)]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
     )
-
-    return {
-        "total_revenue": total_revenue,
-        "active_leads": active_leads,
-        "conversion_rate": round(conversion_rate, 2),
-        "closed_deals": closed_deals
-    }
 @router.get("/activities")
-def get_recent_activities(current_user: dict = Depends(get_current_user)):
-
-    activities = (
-        supabase.table("activities")
-        .select("*")
-        .eq("user_email", current_user["email"])
-        .order("created_at", desc=True)
-        .limit(5)
-        .execute()
+async def get_recent_activities(request: Request, response: Response, current_user: Principal = Depends(get_current_user)):
+
+    email = current_user.email
+
+    async def load():
+        activities = await (
+            supabase.table("activities")
+            .select(ACTIVITY_COLUMNS)
+            .eq("user_email", email)
+            .order("created_at", desc=True)
+            .limit(5)
+            .execute()
+        )
+        return activities.data or []
+
+    cache_key = response_cache.make_key("dashboard.activities", email)
+    tags = [owner_tag(ACTIVITIES, email)]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
     )
 
-    return activities.data or []
-from fastapi.responses import StreamingResponse
-import io
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
-@router.get("/generate-report")
-def generate_report(current_user=Depends(get_current_user)):
-
-    email = current_user["email"]
-
-    # Get user id
-    user_res = supabase.table("users") \
-        .select("id") \
-        .eq("email", email) \
-        .single() \
-        .execute()
-
-    if not user_res.data:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user_id = user_res.data["id"]
 
-    # Fetch leads
-    leads = supabase.table("leads") \
-        .select("*") \
-        .eq("owner_email", email) \
-        .execute().data or []
-
-    # Fetch deals
-    deals = supabase.table("deals") \
-        .select("*") \
-        .eq("owner_id", user_id) \
-        .execute().data or []
+@router.get("/generate-report")
+async def generate_report(current_user: Principal = Depends(get_current_user)):
 
     # ===== CALCULATIONS =====
-    total_leads = len(leads)
-    total_deals = len(deals)
-
-    won_deals = [
-        d for d in deals
-        if d.get("stage") and d["stage"].lower() == "won"
-    ]
-
-    lost_deals = [
-        d for d in deals
-        if d.get("stage") and d["stage"].lower() == "lost"
-    ]
-
-    closed_deals = len(won_deals)
-
-    total_revenue = sum(
-        float(d.get("value", 0))
-        for d in won_deals
-    )
-
-    conversion_rate = (
-        (closed_deals / total_leads) * 100
-        if total_leads else 0
-    )
+    kpis = await fetch_dashboard_kpis(current_user.email, current_user.id)
 
     # ===== CREATE PDF =====
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # Title
-    elements.append(Paragraph("CRM Dashboard Report", styles["Title"]))
-    elements.append(Spacer(1, 20))
-
-    # Summary
-    elements.append(Paragraph(f"Total Leads: {total_leads}", styles["Normal"]))
-    elements.append(Paragraph(f"Total Deals: {total_deals}", styles["Normal"]))
-    elements.append(Paragraph(f"Closed Deals: {closed_deals}", styles["Normal"]))
-    elements.append(Paragraph(f"Total Revenue: ₹{total_revenue}", styles["Normal"]))
-    elements.append(Paragraph(f"Conversion Rate: {round(conversion_rate, 2)}%", styles["Normal"]))
-
-    elements.append(Spacer(1, 20))
+    # Rendered in the PDF process pool; unchanged KPIs are served from cache
+    pdf = await render_dashboard_report(kpis)
 
-    # KPI Table
-    data = [
-        ["Metric", "Value"],
-        ["Total Leads", total_leads],
-        ["Total Deals", total_deals],
-        ["Won Deals", closed_deals],
-        ["Lost Deals", len(lost_deals)],
-        ["Revenue", f"₹{total_revenue}"],
-        ["Conversion Rate", f"{round(conversion_rate, 2)}%"],
-    ]
-
-    table = Table(data, colWidths=[250, 150])
-
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
-    ]))
-
-    elements.append(table)
-
-    doc.build(elements)
-    buffer.seek(0)
-
-    return StreamingResponse(
-        buffer,
+    return Response(
+        content=pdf,
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=dashboard_report.pdf"}
     )
@@ -210,21 +83,21 @@ def generate_report(current_user=Depends(get_current_user)):
 
     # Step 1: Check role (optional but recommended)
 @router.post("/send-campaign")
-def send_campaign(
+async def send_campaign(
     data: dict = Body(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
 
-    if current_user["role"] not in ["admin", "manager"]:
+    if current_user.role not in ["admin", "manager"]:
         raise HTTPException(status_code=403, detail="Not authorized")
 
     if not data.get("title"):
         raise HTTPException(status_code=400, detail="Campaign title required")
 
-    result = supabase.table("campaigns").insert({
+    result = await supabase.table("campaigns").insert({
         "title": data["title"],
         "description": data.get("description", ""),
-        "created_by": current_user["email"],
+        "created_by": current_user.email,
         "status": "sent"
     }).execute()
 
@@ -239,38 +112,18 @@ def send_campaign(
 # SYNC DATA
 # ===============================
 @router.post("/sync-data")
-def sync_data(current_user=Depends(get_current_user)):
-
-    # 1️⃣ Fetch external leads
-    external_res = supabase.table("external_leads").select("*").execute()
-    external_leads = external_res.data or []
-
-    if not external_leads:
-        return {"message": "No external data found"}
-
-    # 2️⃣ Fetch existing leads (avoid duplicates)
-    existing_res = supabase.table("leads").select("first_name,last_name,company").execute()
-    existing_leads = existing_res.data or []
-
-    existing_set = {
-        (lead["first_name"], lead["last_name"], lead["company"])
-        for lead in existing_leads
-    }
-
-    # 3️⃣ Insert only new leads
-    new_leads = []
+async def sync_data(
+    source: str = Query("external_leads", description="External source to pull from"),
+    current_user: Principal = Depends(get_current_user)
+):
 
-    for lead in external_leads:
-        key = (lead["first_name"], lead["last_name"], lead["company"])
+    if source not in SYNC_SOURCES:
+        raise HTTPException(status_code=400, detail=f"Unknown sync source: {source}")
 
-        if key not in existing_set:
-            new_leads.append({
-                "first_name": lead["first_name"],
-                "last_name": lead["last_name"],
-                "company": lead["company"]
-            })
+    # Pull only rows changed since this owner's last sync of the source
+    result = await sync_source(source, current_user.email)
 
-    if new_leads:
-        supabase.table("leads").insert(new_leads).execute()
+    if result["synced"]:
+        response_cache.invalidate(owner_tag(LEADS, current_user.email), LEADS)
 
-    return {"message": f"{len(new_leads)} leads synced successfully"}
\ No newline at end of file
+    return {"message": f"{result['synced']} leads synced successfully", **result}
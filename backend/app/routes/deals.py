@@ -1,33 +1,181 @@
 #crm-sys/backend/app/routes/deals.py
 #from fastapi import APIRouter, HTTPException
 from fastapi import Depends
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.routes.auth import get_current_user 
+from app.models.user import Principal
 from app.models.deals import Deal, DealCreate, DealUpdate
+from app.models.bulk import BulkRequest, BulkResponse
+from app.services.bulk import BulkWriter
 from app.services.supabase_client import supabase
-from datetime import datetime
+from app.services.export import open_csv_export
+from app.services.activity_log import activity_log
+from app.services.cache import response_cache, owner_tag, DEALS
+from app.utils.pagination import apply_cursor, order_by_cursor, next_cursor, NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.utils.conditional import conditional_response
+from app.utils.fields import parse_fields, select_clause, FIELDS_DESCRIPTION, LIST_FIELDS_DESCRIPTION
+from app.utils.responses import rows_response
+from typing import Optional
+from datetime import date, datetime
 
 router = APIRouter(prefix="/deals", tags=["Deals"])
 
-# Get all deals
-# Get all deals, most recent first
+# CSV columns for export
+EXPORT_COLUMNS = ["title", "company", "value", "stage", "lead_id", "owner_id", "close_date", "notes", "created_at"]
+
+# List deals, most recent first (owner-scoped, filterable, cursor-paginated)
 @router.get("/", response_model=list[Deal])
-async def get_deals():
-    response = (
-        supabase.table("deals")
-        .select("*")
-        .order("created_at", desc=True)  # ← order by created_at descending
-        .execute()
+async def get_deals(
+    request: Request,
+    response: Response,
+    stage: Optional[str] = Query(None, description="Filter by stage"),
+    owner_id: Optional[int] = Query(None, description="Owner to list (Admins only for other owners)"),
+    min_value: Optional[float] = Query(None, description="Minimum deal value"),
+    max_value: Optional[float] = Query(None, description="Maximum deal value"),
+    close_from: Optional[date] = Query(None, description="Earliest close date"),
+    close_to: Optional[date] = Query(None, description="Latest close date"),
+    limit: int = Query(100, ge=1, le=1000, description="Max results"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    include_total: bool = Query(True, description=f"Send {TOTAL_COUNT_HEADER} on the first page"),
+    fields: Optional[str] = Query(None, description=LIST_FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
+):
+    owner = owner_id if owner_id is not None else current_user.id
+    if owner != current_user.id and not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Not authorized to list these deals")
+
+    # The total ignores the cursor, so only the first page pays for it
+    count = "exact" if include_total and not cursor else None
+    columns = parse_fields(fields, Deal.model_fields, always=("id", "created_at"))
+    cache_key = response_cache.make_key(
+        "deals.list", owner, stage=stage, min_value=min_value, max_value=max_value,
+        close_from=close_from, close_to=close_to, limit=limit, cursor=cursor, count=count,
+        fields=tuple(columns) if columns else None
     )
-    if not response.data:
-        return []  # return empty list if no deals
-    return response.data
+
+    async def load():
+        q = supabase.table("deals").select(select_clause(columns), count=count).eq("owner_id", owner)
+
+        if stage:
+            q = q.eq("stage", stage)
+        if min_value is not None:
+            q = q.gte("value", min_value)
+        if max_value is not None:
+            q = q.lte("value", max_value)
+        if close_from:
+            q = q.gte("close_date", close_from.isoformat())
+        if close_to:
+            q = q.lte("close_date", close_to.isoformat())
+
+        q = order_by_cursor(q, "created_at")  # ← newest first, deals without created_at last
+        if cursor:
+            q = apply_cursor(q, cursor, "created_at")
+
+        result = await q.limit(limit).execute()
+        return result.data or [], result.count
+
+    tags = [owner_tag(DEALS, owner)]
+
+    not_modified = conditional_response(request, response, response_cache.etag(cache_key, tags))
+    if not_modified:
+        return not_modified
+
+    deals, total = await response_cache.get_or_load(cache_key, tags, load)
+
+    cursor_out = next_cursor(deals, limit, "created_at")
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    # Rows are our own; skip response_model re-validation (fields= rows are partial)
+    return rows_response(deals, columns or Deal.model_fields, response)
+
+
+# Export the current user's deals (CSV), streamed in batches
+@router.get("/export")
+async def export_deals(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
+):
+    columns = parse_fields(fields, EXPORT_COLUMNS, always=()) or EXPORT_COLUMNS
+    try:
+        chunks = await open_csv_export(
+            "deals",
+            columns,
+            owner_column="owner_id",
+            owner=current_user.id
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting deals: {e}")
+
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=deals.csv"}
+    )
+
+
+# Bulk create / update / delete
+def _bulk_record(deal: DealCreate, owner_id: int) -> dict:
+    record = deal.model_dump(mode="json")
+    record["owner_id"] = owner_id
+    return record
+
+
+def _bulk_changes(deal: DealUpdate) -> dict:
+    return deal.model_dump(mode="json", exclude_unset=True)
+
+
+# Same rule as the listing: Admins may act on other owners' deals
+bulk_deals_writer = BulkWriter(
+    "deals", "owner_id", DealCreate, DealUpdate,
+    to_create=_bulk_record, to_update=_bulk_changes,
+    admin_ops=("update", "delete")
+)
+
+
+@router.post("/bulk", response_model=BulkResponse, response_model_exclude_none=True)
+async def bulk_deals(ops: BulkRequest, current_user: Principal = Depends(get_current_user)):
+    summary, changes = await bulk_deals_writer.run(ops, current_user.id, current_user.is_admin)
+
+    now = datetime.utcnow().isoformat()
+    for deal in changes["create"]:
+        await activity_log.record({
+            "user_email": current_user.email,
+            "type": "deal_created",
+            "message": f"New deal created worth ₹{deal.get('value')}",
+            "amount": deal.get("value"),
+            "created_at": now
+        })
+    for deal in changes["update"]:
+        if (deal.get("stage") or "").lower() == "won":
+            await activity_log.record({
+                "user_email": current_user.email,
+                "type": "deal_won",
+                "message": f"Deal closed WON worth ₹{deal.get('value')}",
+                "amount": deal.get("value"),
+                "created_at": now
+            })
+        else:
+            await activity_log.record({
+                "user_email": current_user.email,
+                "type": "deal_updated",
+                "message": f"Deal updated worth ₹{deal.get('value')}",
+                "created_at": now
+            })
+
+    owners = {current_user.id, *changes["previous_owners"]}
+    owners.update(row.get("owner_id") for row in changes["update"] + changes["delete"])
+    response_cache.invalidate(DEALS, *(owner_tag(DEALS, o) for o in owners if o is not None))
+
+    return summary
 
 
 # Get a single deal
 @router.get("/{deal_id}", response_model=Deal)
 async def get_deal(deal_id: int):
-    response = supabase.table("deals").select("*").eq("id", deal_id).single().execute()
+    response = await supabase.table("deals").select("*").eq("id", deal_id).single().execute()
     if not response.data:
         raise HTTPException(status_code=404, detail="Deal not found")
     return response.data
@@ -37,28 +185,18 @@ async def get_deal(deal_id: int):
 @router.post("/", response_model=Deal)
 async def create_deal(
     deal: DealCreate,
-    current_user=Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     deal_dict = deal.dict()
 
-    # Get logged-in user id
-    email = current_user["email"]
-
-    user = supabase.table("users") \
-        .select("id") \
-        .eq("email", email) \
-        .single() \
-        .execute()
-
-    user_id = user.data["id"]
-
     # Assign owner automatically
+    user_id = current_user.id
     deal_dict["owner_id"] = user_id
 
     if "close_date" in deal_dict and deal_dict["close_date"]:
         deal_dict["close_date"] = str(deal_dict["close_date"])
 
-    response = supabase.table("deals").insert(deal_dict).execute()
+    response = await supabase.table("deals").insert(deal_dict).execute()
 
     if not response.data:
         raise HTTPException(status_code=400, detail="Failed to create deal")
@@ -66,13 +204,18 @@ async def create_deal(
     new_deal = response.data[0]
 
 # 🔥 Log Activity
-    supabase.table("activities").insert({
-        "user_email": current_user["email"],
+    await activity_log.record({
+        "user_email": current_user.email,
         "type": "deal_created",
         "message": f"New deal created worth ₹{new_deal.get('value')}",
         "amount": new_deal.get("value"),
         "created_at": datetime.utcnow().isoformat()
-    }).execute()
+    })
+
+    response_cache.invalidate(
+        owner_tag(DEALS, user_id),
+        DEALS
+    )
 
     return new_deal
     
@@ -83,14 +226,20 @@ async def create_deal(
 async def update_deal(
     deal_id: int,
     deal: DealUpdate,
-    current_user=Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     update_data = deal.dict(exclude_unset=True)
 
     if "close_date" in update_data and update_data["close_date"]:
         update_data["close_date"] = str(update_data["close_date"])
 
-    response = supabase.table("deals").update(update_data).eq("id", deal_id).execute()
+    # Reassignments must also invalidate the previous owner's lists and stats
+    previous_owner = None
+    if "owner_id" in update_data:
+        previous = await supabase.table("deals").select("owner_id").eq("id", deal_id).execute()
+        previous_owner = previous.data[0]["owner_id"] if previous.data else None
+
+    response = await supabase.table("deals").update(update_data).eq("id", deal_id).execute()
 
     if not response.data:
         raise HTTPException(status_code=404, detail="Deal not found or update failed")
@@ -99,27 +248,34 @@ async def update_deal(
 
     # 🔥 Log WON separately
     if updated_deal.get("stage", "").lower() == "won":
-        supabase.table("activities").insert({
-            "user_email": current_user["email"],
+        await activity_log.record({
+            "user_email": current_user.email,
             "type": "deal_won",
             "message": f"Deal closed WON worth ₹{updated_deal.get('value')}",
             "amount": updated_deal.get("value"),
             "created_at": datetime.utcnow().isoformat()
-        }).execute()
+        })
     else:
-        supabase.table("activities").insert({
-            "user_email": current_user["email"],
+        await activity_log.record({
+            "user_email": current_user.email,
             "type": "deal_updated",
             "message": f"Deal updated worth ₹{updated_deal.get('value')}",
             "created_at": datetime.utcnow().isoformat()
-        }).execute()
+        })
+
+    tags = [owner_tag(DEALS, updated_deal.get("owner_id")), DEALS]
+    if previous_owner is not None and previous_owner != updated_deal.get("owner_id"):
+        tags.append(owner_tag(DEALS, previous_owner))
+    response_cache.invalidate(*tags)
 
     return updated_deal
 
 # Delete deal
 @router.delete("/{deal_id}")
 async def delete_deal(deal_id: int):
-    response = supabase.table("deals").delete().eq("id", deal_id).execute()
+    response = await supabase.table("deals").delete().eq("id", deal_id).execute()
     if not response.data:
         raise HTTPException(status_code=404, detail="Deal not found or already deleted")
+
+    response_cache.invalidate(owner_tag(DEALS, response.data[0].get("owner_id")), DEALS)
     return {"message": "Deal deleted successfully"}
@@ -1,24 +1,46 @@
 # app/routes/lead.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Body, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response, status
 from fastapi.responses import StreamingResponse
 
 from fastapi import UploadFile, File
-import csv
-import io
-
 from typing import List, Optional
 from datetime import date, datetime
 from pydantic import BaseModel
 
 from app.services.supabase_client import supabase
+from app.services.activity_log import activity_log
+from app.services.cache import response_cache, owner_tag, LEADS
 from app.routes.auth import get_current_user
-from app.models.lead import Lead, LeadCreate  # ✅ Using models
+from app.models.user import Principal
+from app.models.lead import Lead, LeadCreate, LeadUpdate  # ✅ Using models
+from app.models.bulk import BulkRequest, BulkResponse
+from app.services.export import open_csv_export
+from app.services.csv_import import import_csv
+from app.services.bulk import BulkWriter
+from app.utils.pagination import apply_cursor, order_by_cursor, next_cursor, NEXT_CURSOR_HEADER
+from app.utils.conditional import conditional_response
+from app.utils.fields import parse_fields, select_clause, FIELDS_DESCRIPTION, LIST_FIELDS_DESCRIPTION
+from app.utils.responses import rows_response
 
 router = APIRouter(
     prefix="/leads",
     tags=["Leads"]
 )
 
+# CSV columns for export (also accepted by import)
+EXPORT_COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "company",
+    "phone",
+    "source",
+    "status",
+    "notes",
+    "owner_email",
+    "created"
+]
+
 # ----------------------------
 # Response Schema (for Create)
 # ----------------------------
@@ -29,59 +51,102 @@ class LeadResponse(BaseModel):
 # Get Leads
 # ----------------------------
 @router.get("/", response_model=List[Lead])
-def get_leads(
+async def get_leads(
+    request: Request,
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by lead status"),
-    search: Optional[str] = Query(None, description="Search first/last/company/email"),
-    limit: int = Query(100, description="Max number of results"),
-    offset: int = Query(0, description="Offset for pagination"),
-    current_user: dict = Depends(get_current_user)
+    search: Optional[str] = Query(None, description="Relevance-ranked search over first/last/company/email (paginate with offset)"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of results"),
+    offset: int = Query(0, description="Offset for pagination (prefer cursor)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    fields: Optional[str] = Query(None, description=LIST_FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
 ):
-    try:
-        q = supabase.table("leads").select("*").eq("owner_email", current_user["email"])
+    email = current_user.email
+    search = search.strip() if search else None
+    # id and created are always kept: the cursor is built from them
+    columns = parse_fields(fields, Lead.model_fields, always=("id", "created"))
+    cache_key = response_cache.make_key(
+        "leads.list", email, status=status, search=search, limit=limit, offset=offset, cursor=cursor,
+        fields=tuple(columns) if columns else None
+    )
+
+    async def load():
+        if search:
+            # Trigram-indexed, ranked search (see sql/lead_search.sql)
+            result = await supabase.rpc("search_leads", {
+                "p_owner_email": email,
+                "p_query": search,
+                "p_status": status,
+                "p_limit": limit,
+                "p_offset": offset
+            }).select(select_clause(columns)).execute()
+            return result.data or []
+
+        q = supabase.table("leads").select(select_clause(columns)).eq("owner_email", email)
 
         if status:
             q = q.eq("status", status)
 
-        if search:
-            like = f"%{search}%"
-            # first_name OR last_name OR company OR email (case-insensitive)
-            q = q.or_(
-                f"first_name.ilike.{like},last_name.ilike.{like},company.ilike.{like},email.ilike.{like}"
-            )
-
-        result = (
-    q.order("created", desc=True)  # 🔹 sort by created timestamp descending
-     .range(offset, offset + limit - 1)
-     .execute()
-)
+        # 🔹 sort by created timestamp descending (id breaks ties)
+        q = order_by_cursor(q)
+        if cursor:
+            q = apply_cursor(q, cursor).limit(limit)
+        else:
+            q = q.range(offset, offset + limit - 1)
 
+        result = await q.execute()
         return result.data or []
+
+    tags = [owner_tag(LEADS, email)]
+
+    # Unchanged since the client's last poll: 304 without querying or serializing
+    not_modified = conditional_response(request, response, response_cache.etag(cache_key, tags))
+    if not_modified:
+        return not_modified
+
+    try:
+        leads = await response_cache.get_or_load(cache_key, tags, load)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching leads: {str(e)}")
 
+    # Search results are ranked, not (created, id) ordered, so they page by offset
+    cursor_out = None if search else next_cursor(leads, limit)
+    if cursor_out:
+        response.headers[NEXT_CURSOR_HEADER] = cursor_out
+    # Rows are our own; skip response_model re-validation (fields= rows are partial)
+    return rows_response(leads, columns or Lead.model_fields, response)
+
 # ----------------------------
 # Create Lead
 # ----------------------------
 @router.post("/", response_model=LeadResponse, status_code=status.HTTP_201_CREATED)
-def create_lead(lead: LeadCreate, current_user: dict = Depends(get_current_user)):
+async def create_lead(lead: LeadCreate, current_user: Principal = Depends(get_current_user)):
     lead_data = lead.dict(exclude_unset=True)
-    lead_data["owner_email"] = current_user["email"]
+    lead_data["owner_email"] = current_user.email
 
     if isinstance(lead_data.get("created"), (date, datetime)):
         lead_data["created"] = lead_data["created"].isoformat()
     
     try:
-        result = supabase.table("leads").insert(lead_data).execute()
+        result = await supabase.table("leads").insert(lead_data).execute()
         new_lead = result.data[0]
     
 
     # 🔹 Log Activity
-        supabase.table("activities").insert({
-          "user_email": current_user["email"],
+        await activity_log.record({
+          "user_email": current_user.email,
           "type": "lead_created",
           "message": f"New lead created: {new_lead.get('first_name')} {new_lead.get('last_name')}",
           "created_at": datetime.utcnow().isoformat()
-        }).execute()
+        })
+
+        response_cache.invalidate(
+            owner_tag(LEADS, current_user.email),
+            LEADS
+        )
 
         return {"message": "Lead created successfully", "lead": new_lead}
 
@@ -92,53 +157,21 @@ def create_lead(lead: LeadCreate, current_user: dict = Depends(get_current_user)
 # Export Report (CSV)
 # ----------------------------
 @router.get("/export")
-def export_leads(current_user: dict = Depends(get_current_user)):
+async def export_leads(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user: Principal = Depends(get_current_user)
+):
+    columns = parse_fields(fields, EXPORT_COLUMNS, always=()) or EXPORT_COLUMNS
     try:
-        result = (
-            supabase
-            .table("leads")
-            .select("*")
-            .eq("owner_email", current_user["email"])
-            .execute()
+        chunks = await open_csv_export(
+            "leads",
+            columns,
+            owner_column="owner_email",
+            owner=current_user.email
         )
 
-        leads = result.data or []
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # CSV header
-        writer.writerow([
-            "first_name",
-            "last_name",
-            "email",
-            "company",
-            "phone",
-            "source",
-            "status",
-            "notes",
-            "owner_email",
-            "created"
-        ])
-
-        for lead in leads:
-            writer.writerow([
-                lead.get("first_name"),
-                lead.get("last_name"),
-                lead.get("email"),
-                lead.get("company"),
-                lead.get("phone"),
-                lead.get("source"),
-                lead.get("status"),
-                lead.get("notes"),
-                lead.get("owner_email"),
-                lead.get("created"),
-            ])
-
-        output.seek(0)
-
         return StreamingResponse(
-            iter([output.getvalue()]),
+            chunks,
             media_type="text/csv",
             headers={
                 "Content-Disposition": "attachment; filename=leads.csv"
@@ -157,10 +190,10 @@ def export_leads(current_user: dict = Depends(get_current_user)):
 # Update Lead
 # ----------------------------
 @router.put("/{lead_id}", response_model=Lead)
-def update_lead(
+async def update_lead(
     lead_id: int,
     lead: dict = Body(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         lead_data = {k: v for k, v in lead.items() if v is not None}
@@ -170,11 +203,11 @@ def update_lead(
         if "created" in lead_data and isinstance(lead_data["created"], (date, datetime)):
             lead_data["created"] = lead_data["created"].isoformat()
 
-        result = (
+        result = await (
             supabase.table("leads")
             .update(lead_data)
             .eq("id", lead_id)
-            .eq("owner_email", current_user["email"])
+            .eq("owner_email", current_user.email)
             .execute()
         )
 
@@ -184,12 +217,19 @@ def update_lead(
         updated_lead = result.data[0]
 
         # Log activity
-        supabase.table("activities").insert({
-            "user_email": current_user["email"],
+        await activity_log.record({
+            "user_email": current_user.email,
             "type": "lead_updated",
             "message": f"Lead updated: {updated_lead.get('first_name')} {updated_lead.get('last_name')}",
             "created_at": datetime.utcnow().isoformat()
-        }).execute()
+        })
+
+        # A reassigned lead leaves the caller's lists and joins the new owner's
+        response_cache.invalidate(
+            owner_tag(LEADS, current_user.email),
+            owner_tag(LEADS, updated_lead.get("owner_email", current_user.email)),
+            LEADS
+        )
 
         return updated_lead
 
@@ -203,27 +243,76 @@ def update_lead(
 @router.post("/import")
 async def import_leads(
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    import csv, io
-
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files allowed")
 
-    content = await file.read()
-    reader = csv.DictReader(io.StringIO(content.decode("utf-8")))
+    imported_at = datetime.utcnow().isoformat()
 
-    rows = []
-    for row in reader:
-        row["owner_email"] = current_user["email"]
-        rows.append(row)
+    def to_record(lead: LeadCreate):
+        # Every row carries the same keys so chunks insert as one statement
+        record = lead.model_dump(mode="json")
+        record["owner_email"] = current_user.email
+        record["created"] = record["created"] or imported_at
+        return record
 
-    if not rows:
+    result = await import_csv(file, "leads", LeadCreate, to_record)
+
+    if not result["inserted"] and not result["rejected"]:
+        if result["errors"]:
+            raise HTTPException(status_code=400, detail=result["errors"][0]["errors"][0]["error"])
         raise HTTPException(status_code=400, detail="CSV file is empty")
 
-    supabase.table("leads").insert(rows).execute()
+    if result["inserted"]:
+        response_cache.invalidate(owner_tag(LEADS, current_user.email), LEADS)
 
     return {
-        "message": "Leads imported successfully",
-        "count": len(rows)
+        "message": "Leads imported successfully" if not result["rejected"] else "Leads imported with errors",
+        "count": result["inserted"],
+        **result
     }
+
+
+# ----------------------------
+# Bulk Create / Update
+# ----------------------------
+def _bulk_record(lead: LeadCreate, owner_email: str) -> dict:
+    # Same keys on every row so each chunk inserts as one statement
+    record = lead.model_dump(mode="json")
+    record["owner_email"] = owner_email
+    record["created"] = record["created"] or datetime.utcnow().isoformat()
+    return record
+
+
+def _bulk_changes(lead: LeadUpdate) -> dict:
+    return {k: v for k, v in lead.model_dump(mode="json", exclude_unset=True).items() if v is not None}
+
+
+bulk_leads_writer = BulkWriter(
+    "leads", "owner_email", LeadCreate, LeadUpdate,
+    to_create=_bulk_record, to_update=_bulk_changes,
+    # Owner-only, like PUT /leads/{id}; there is no DELETE /leads/{id} either
+    admin_ops=(), allow_delete=False
+)
+
+
+@router.post("/bulk", response_model=BulkResponse, response_model_exclude_none=True)
+async def bulk_leads(ops: BulkRequest, current_user: Principal = Depends(get_current_user)):
+    summary, changes = await bulk_leads_writer.run(ops, current_user.email, current_user.is_admin)
+
+    now = datetime.utcnow().isoformat()
+    for op, kind, verb in (("create", "lead_created", "New lead created"), ("update", "lead_updated", "Lead updated")):
+        for row in changes[op]:
+            await activity_log.record({
+                "user_email": current_user.email,
+                "type": kind,
+                "message": f"{verb}: {row.get('first_name')} {row.get('last_name')}",
+                "created_at": now
+            })
+
+    owners = {current_user.email, *changes["previous_owners"]}
+    owners.update(row.get("owner_email") for row in changes["update"])
+    response_cache.invalidate(LEADS, *(owner_tag(LEADS, o) for o in owners if o))
+
+    return summary
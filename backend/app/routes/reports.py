@@ -1,104 +1,136 @@
 # app/api/reports.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.services.supabase_client import supabase
+from app.services.cache import response_cache, LEADS, DEALS
+from app.services.pdf_reports import render_crm_report
+from app.services.query_batch import gather_queries, QueryBatchTimeout
+from app.utils.conditional import conditional_response
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 # Deals by stage
 @router.get("/deals-by-stage")
-async def deals_by_stage():
-    response = supabase.table("deals").select("stage").execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="No deals found")
-
-    stages = {}
-    for row in response.data:
-        stage = row["stage"]
-        stages[stage] = stages.get(stage, 0) + 1
-    return stages
+async def deals_by_stage(request: Request, response: Response):
+    async def load():
+        # Counters are kept by triggers (sql/report_rollups.sql)
+        response = await (
+            supabase.table("report_rollups")
+            .select("dim,value")
+            .eq("metric", "deals_by_stage")
+            .gt("value", 0)
+            .execute()
+        )
+        if not response.data:
+            raise HTTPException(status_code=404, detail="No deals found")
+
+        return {row["dim"]: row["value"] for row in response.data}
+
+    cache_key = response_cache.make_key("reports.deals_by_stage", "*")
+    tags = [DEALS]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
+    )
 
 
 # Revenue by month
 @router.get("/revenue-by-month")
-async def revenue_by_month():
-    response = supabase.rpc("revenue_by_month").execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="No revenue data found")
-    return response.data
+async def revenue_by_month(request: Request, response: Response):
+    async def load():
+        response = await supabase.rpc("revenue_by_month").execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="No revenue data found")
+        return response.data
+
+    cache_key = response_cache.make_key("reports.revenue_by_month", "*")
+    tags = [DEALS]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
+    )
 
 
 # Top performing sales reps
 @router.get("/top-sales")
-async def top_sales():
-    response = supabase.rpc("top_sales_reps").execute()
-    if not response.data:
-        raise HTTPException(status_code=404, detail="No sales data found")
-    return response.data
+async def top_sales(request: Request, response: Response):
+    async def load():
+        response = await supabase.rpc("top_sales_reps").execute()
+        if not response.data:
+            raise HTTPException(status_code=404, detail="No sales data found")
+        return response.data
+
+    cache_key = response_cache.make_key("reports.top_sales", "*")
+    tags = [DEALS]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
+    )
 
 
 # Conversion rate (leads → deals → won)
 @router.get("/conversion-rate")
-async def conversion_rate():
-    leads_resp = supabase.table("leads").select("id", count="exact").execute()
-    deals_resp = supabase.table("deals").select("id", count="exact").execute()
-    won_resp = supabase.table("deals").select("id", count="exact").eq("stage", "won").execute()
-
-    leads_count = leads_resp.count or 0
-    deals_count = deals_resp.count or 0
-    won_deals_count = won_resp.count or 0
-
-    return {
-        "leads": leads_count,
-        "deals": deals_count,
-        "won_deals": won_deals_count,
-        "conversion_rate": (won_deals_count / leads_count * 100) if leads_count else 0
-    }
-from fastapi.responses import FileResponse
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import os
+async def conversion_rate(request: Request, response: Response):
+    async def load():
+        response = await (
+            supabase.table("report_rollups")
+            .select("metric,value")
+            .in_("metric", ["leads_total", "deals_total", "deals_won"])
+            .eq("dim", "")
+            .execute()
+        )
+        counters = {row["metric"]: row["value"] for row in response.data or []}
+
+        leads_count = counters.get("leads_total", 0)
+        deals_count = counters.get("deals_total", 0)
+        won_deals_count = counters.get("deals_won", 0)
+
+        return {
+            "leads": leads_count,
+            "deals": deals_count,
+            "won_deals": won_deals_count,
+            "conversion_rate": (won_deals_count / leads_count * 100) if leads_count else 0
+        }
+
+    cache_key = response_cache.make_key("reports.conversion_rate", "*")
+    tags = [LEADS, DEALS]
+    return (
+        conditional_response(request, response, response_cache.etag(cache_key, tags))
+        or await response_cache.get_or_load(cache_key, tags, load)
+    )
 
 
 @router.get("/generate-report")
 async def generate_report():
 
-    file_path = "crm_report.pdf"
-
-    doc = SimpleDocTemplate(file_path)
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # ✅ LOGO (Correct Path)
-    logo_path = os.path.join(os.getcwd(), "app", "static", "logo.png")
-
-    print("Logo path:", logo_path)
-    print("Logo exists:", os.path.exists(logo_path))
-
-    if os.path.exists(logo_path):
-        logo = Image(logo_path, width=150, height=80)
-        logo.hAlign = "CENTER"
-        elements.append(logo)
-        elements.append(Spacer(1, 20))
-
-    # ✅ TITLE
-    elements.append(Paragraph("CRM Dashboard Report", styles["Title"]))
-    elements.append(Spacer(1, 20))
-
-    # ✅ SAMPLE DATA (Replace with your real data if needed)
-    elements.append(Paragraph("Total Leads: 60", styles["Normal"]))
-    elements.append(Paragraph("Total Deals: 19", styles["Normal"]))
-    elements.append(Paragraph("Closed Deals: 14", styles["Normal"]))
-    elements.append(Paragraph("Total Revenue: Rs 11,029,250.00", styles["Normal"]))
-    elements.append(Paragraph("Conversion Rate: 23.33%", styles["Normal"]))
-
-    # ✅ PAGE BORDER FUNCTION
-    def add_border(canvas, doc):
-        canvas.saveState()
-        canvas.setStrokeColor(colors.black)
-        canvas.rect(20, 20, 550, 800)
-        canvas.restoreState()
+    # Counters and revenue are independent, so fetch them concurrently
+    try:
+        counters_resp, revenue_resp = await gather_queries(
+            supabase.table("report_rollups")
+            .select("metric,value")
+            .in_("metric", ["leads_total", "deals_total", "deals_won"])
+            .eq("dim", ""),
+            supabase.rpc("revenue_by_month")
+        )
+    except QueryBatchTimeout:
+        raise HTTPException(status_code=504, detail="Report data took too long to load")
+
+    counters = {row["metric"]: row["value"] for row in counters_resp.data or []}
+    leads_count = counters.get("leads_total", 0)
+    won_deals_count = counters.get("deals_won", 0)
+
+    summary = {
+        "total_leads": leads_count,
+        "total_deals": counters.get("deals_total", 0),
+        "closed_deals": won_deals_count,
+        "total_revenue": float(sum(row.get("total_sales") or 0 for row in revenue_resp.data or [])),
+        "conversion_rate": (won_deals_count / leads_count * 100) if leads_count else 0
+    }
 
-    doc.build(elements, onFirstPage=add_border, onLaterPages=add_border)
+    # Rendered in memory in the PDF process pool and cached by its inputs
+    pdf = await render_crm_report(summary)
 
-    return FileResponse(file_path, media_type="application/pdf", filename="crm_report.pdf")
\ No newline at end of file
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={"Content-Disposition": 'attachment; filename="crm_report.pdf"'}
+    )
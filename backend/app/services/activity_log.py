@@ -0,0 +1,143 @@
+# app/services/activity_log.py
+import asyncio
+import logging
+from datetime import datetime
+
+from app import config
+from app.services.supabase_client import supabase
+from app.services.cache import response_cache, owner_tag, ACTIVITIES
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ActivityLog:
+    """
+    Write-behind queue for the ``activities`` table.
+
+    Handlers ``record()`` an event and return immediately; a background task
+    flushes queued events as multi-row inserts once ``batch_size`` events
+    are waiting or ``flush_interval_ms`` has passed. The queue is bounded:
+    when it is full, ``record()`` waits up to ``enqueue_timeout`` seconds
+    (backpressure) and then drops the event rather than stall the request.
+    ``stop()`` drains everything still queued.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_interval_ms: int, enqueue_timeout: float, retries: int):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.enqueue_timeout = enqueue_timeout
+        self.retries = retries
+        self._queue = None
+        self._batch_full = None
+        self._task = None
+        self._stopping = False
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._batch_full = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopping = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def record(self, event: dict):
+        event.setdefault("created_at", datetime.utcnow().isoformat())
+
+        if not self.running:
+            # No flusher (startup, shutdown, scripts): write straight through
+            await self._write([event])
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.put(event), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            logger.warning("Activity queue full, dropping %s event", event.get("type"))
+            return
+
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_full.set()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            batch = []
+            if first is _STOP:
+                stopping = True
+            else:
+                batch.append(first)
+                # Flush on size or after the interval, whichever comes first
+                if self._queue.qsize() < self.batch_size - 1:
+                    self._batch_full.clear()
+                    try:
+                        await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+            # Drain whatever is waiting, in batch_size chunks
+            while not self._queue.empty():
+                event = self._queue.get_nowait()
+                if event is _STOP:
+                    stopping = True
+                    continue
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    await self._write(batch)
+                    batch = []
+
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, events: list):
+        # Multi-row inserts need every row to carry the same keys
+        keys = set().union(*events)
+        rows = [{key: event.get(key) for key in keys} for event in events]
+
+        for attempt in range(1, self.retries + 1):
+            try:
+                await supabase.table("activities").insert(rows).execute()
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    self.failed += len(rows)
+                    logger.error("Dropping %d activities after %d attempts: %s", len(rows), attempt, e)
+                    return
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+        self.flushed += len(rows)
+        response_cache.invalidate(*{owner_tag(ACTIVITIES, row.get("user_email")) for row in rows})
+
+
+activity_log = ActivityLog(
+    max_queue=config.ACTIVITY_QUEUE_SIZE,
+    batch_size=config.ACTIVITY_BATCH_SIZE,
+    flush_interval_ms=config.ACTIVITY_FLUSH_INTERVAL_MS,
+    enqueue_timeout=config.ACTIVITY_ENQUEUE_TIMEOUT,
+    retries=config.ACTIVITY_FLUSH_RETRIES
+)
@@ -0,0 +1,147 @@
+# app/services/admission.py
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from app import config
+
+# ----------------------------
+# Route classes
+# ----------------------------
+LIGHT = "light"  # ordinary reads and writes
+HEAVY = "heavy"  # exports, imports, bulk writes and syncs: many Supabase calls each
+CPU = "cpu"      # bcrypt and PDF rendering
+
+_CLASSES = {
+    ("GET", "/leads/export"): HEAVY,
+    ("GET", "/contacts/export"): HEAVY,
+    ("GET", "/deals/export"): HEAVY,
+    ("POST", "/leads/import"): HEAVY,
+    ("POST", "/leads/bulk"): HEAVY,
+    ("POST", "/contacts/bulk"): HEAVY,
+    ("POST", "/deals/bulk"): HEAVY,
+    ("POST", "/dashboard/sync-data"): HEAVY,
+    ("POST", "/auth/login"): CPU,
+    ("POST", "/auth/signup"): CPU,
+    ("PUT", "/auth/update-profile"): CPU,
+    ("GET", "/dashboard/generate-report"): CPU,
+    ("GET", "/reports/generate-report"): CPU,
+}
+
+COSTS = {
+    LIGHT: 1.0,
+    HEAVY: config.ADMISSION_HEAVY_COST,
+    CPU: config.ADMISSION_CPU_COST,
+}
+
+
+def classify(method: str, path: str) -> str:
+    return _CLASSES.get((method, path.rstrip("/") or "/"), LIGHT)
+
+
+class TokenBuckets:
+    """
+    Per-key token buckets in a bounded LRU.
+
+    Each key refills at ``rate`` tokens per second up to ``burst``. A key
+    evicted from the LRU simply starts again with a full bucket, which is
+    what an idle key would have had anyway.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+
+    def take(self, key, cost: float) -> float:
+        """Spend ``cost`` tokens; returns 0 if admitted, else seconds until they would be."""
+        now = time.monotonic()
+        cost = min(cost, self.burst)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return 0.0
+
+        bucket[0] = tokens
+        return (cost - tokens) / self.rate
+
+    def refund(self, key, cost: float):
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            bucket[0] = min(self.burst, bucket[0] + cost)
+
+
+class ConcurrencyGate:
+    """
+    Concurrency cap with a short, bounded FIFO queue.
+
+    Up to ``limit`` holders run at once and up to ``queue_size`` more wait
+    at most ``timeout`` seconds for a slot. ``acquire()`` returns False
+    instead of waiting longer, so an overloaded class sheds load quickly
+    rather than building a backlog nobody will wait for.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.queued = 0
+        self._waiters = deque()
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.limit and not self.queued:
+            self.in_flight += 1
+            return True
+        if self.queued >= self.queue_size:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            # release() hands its slot straight to the waiter, so in_flight is unchanged
+            await asyncio.wait_for(waiter, self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # a slot arrived just as the wait timed out (3.12+ wait_for)
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # a slot arrived just as the client went away
+            raise
+        finally:
+            self.queued -= 1
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+user_buckets = TokenBuckets(
+    rate=config.ADMISSION_USER_RATE,
+    burst=config.ADMISSION_USER_BURST,
+    max_keys=config.ADMISSION_MAX_USERS
+)
+
+gates = {
+    LIGHT: ConcurrencyGate(config.ADMISSION_LIGHT_CONCURRENCY, config.ADMISSION_QUEUE_SIZE, config.ADMISSION_QUEUE_TIMEOUT),
+    HEAVY: ConcurrencyGate(config.ADMISSION_HEAVY_CONCURRENCY, config.ADMISSION_QUEUE_SIZE, config.ADMISSION_QUEUE_TIMEOUT),
+    CPU: ConcurrencyGate(config.ADMISSION_CPU_CONCURRENCY, config.ADMISSION_QUEUE_SIZE, config.ADMISSION_QUEUE_TIMEOUT),
+}
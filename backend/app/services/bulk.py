@@ -0,0 +1,207 @@
+# app/services/bulk.py
+import json
+
+from pydantic import ValidationError
+
+from app import config
+from app.services.supabase_client import supabase
+
+
+_OP_ORDER = {"create": 0, "update": 1, "delete": 2}
+
+
+def _validation_errors(e: ValidationError) -> list:
+    return [
+        {"field": ".".join(str(p) for p in err["loc"]), "error": err["msg"]}
+        for err in e.errors()
+    ]
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BulkWriter:
+    """
+    Applies a ``BulkRequest`` to one owner-scoped table in chunked round trips.
+
+    * creates: each item is validated with ``create_model`` and turned into a
+      row by ``to_create``; valid rows go out as multi-row inserts.
+    * updates / deletes: the targeted ids are looked up first (one query per
+      chunk) so every item gets the same ownership check as the single-record
+      endpoints: the owner may always act, Admins may act on anyone's rows
+      for the ops listed in ``admin_ops``. Updates with identical payloads
+      (e.g. "reassign these 2,000 leads") are applied as one ``id in (...)``
+      PATCH per chunk.
+    * deletes are refused item by item (405) when ``allow_delete`` is False,
+      for collections whose API has no delete endpoint.
+
+    ``run()`` returns the per-item results plus the rows that changed, so the
+    route can log activities and invalidate caches.
+    """
+
+    def __init__(self, table: str, owner_column: str, create_model, update_model, to_create, to_update, admin_ops=("delete",), allow_delete: bool = True, chunk_size: int = None):
+        self.table = table
+        self.owner_column = owner_column
+        self.create_model = create_model
+        self.update_model = update_model
+        self.to_create = to_create
+        self.to_update = to_update
+        self.admin_ops = set(admin_ops)
+        self.allow_delete = allow_delete
+        self.chunk_size = chunk_size or config.BULK_CHUNK_SIZE
+
+    async def run(self, ops, owner, is_admin: bool) -> tuple:
+        results = []
+        changes = {"create": [], "update": [], "delete": [], "previous_owners": set()}
+
+        await self._create(ops.create, owner, results, changes)
+
+        deletes = ops.delete
+        if not self.allow_delete:
+            results.extend(
+                {"op": "delete", "index": index, "id": row_id, "status": 405, "error": f"Deleting {self.table} is not supported"}
+                for index, row_id in enumerate(deletes)
+            )
+            deletes = []
+
+        owners = await self._lookup_owners([i.get("id") for i in ops.update if isinstance(i.get("id"), int)] + deletes)
+        await self._update(ops.update, owner, is_admin, owners, results, changes)
+        await self._delete(deletes, owner, is_admin, owners, results, changes)
+
+        results.sort(key=lambda r: (_OP_ORDER[r["op"]], r["index"]))
+        summary = {
+            "created": len(changes["create"]),
+            "updated": len(changes["update"]),
+            "deleted": len(changes["delete"]),
+            "failed": sum(1 for r in results if r["status"] >= 400),
+            "results": results
+        }
+        return summary, changes
+
+    # ----------------------------
+    # Create
+    # ----------------------------
+    async def _create(self, items, owner, results, changes):
+        rows, indexes = [], []
+        for index, item in enumerate(items):
+            try:
+                rows.append(self.to_create(self.create_model.model_validate(item), owner))
+                indexes.append(index)
+            except ValidationError as e:
+                results.append({"op": "create", "index": index, "status": 422, "errors": _validation_errors(e)})
+
+        for start in range(0, len(rows), self.chunk_size):
+            chunk_rows = rows[start:start + self.chunk_size]
+            chunk_indexes = indexes[start:start + self.chunk_size]
+            try:
+                inserted = (await supabase.table(self.table).insert(chunk_rows).execute()).data or []
+            except Exception as e:
+                results.extend({"op": "create", "index": i, "status": 500, "error": f"Insert failed: {e}"} for i in chunk_indexes)
+                continue
+
+            # PostgREST returns inserted rows in request order
+            for index, row in zip(chunk_indexes, inserted):
+                results.append({"op": "create", "index": index, "status": 201, "id": row.get("id")})
+            changes["create"].extend(inserted)
+
+    # ----------------------------
+    # Ownership
+    # ----------------------------
+    async def _lookup_owners(self, ids: list) -> dict:
+        owners = {}
+        for chunk in _chunks(sorted(set(ids)), self.chunk_size):
+            response = await (
+                supabase.table(self.table)
+                .select(f"id,{self.owner_column}")
+                .in_("id", chunk)
+                .execute()
+            )
+            owners.update((row["id"], row.get(self.owner_column)) for row in response.data or [])
+        return owners
+
+    def _authorize(self, op, index, row_id, owner, is_admin, owners, results) -> bool:
+        if row_id not in owners:
+            results.append({"op": op, "index": index, "id": row_id, "status": 404, "error": "Not found"})
+            return False
+        if owners[row_id] != owner and not (is_admin and op in self.admin_ops):
+            results.append({"op": op, "index": index, "id": row_id, "status": 403, "error": "Not authorized"})
+            return False
+        return True
+
+    def _scoped(self, q, owner, is_admin, op):
+        # Re-check ownership in the write itself in case a row changed hands
+        if is_admin and op in self.admin_ops:
+            return q
+        return q.eq(self.owner_column, owner)
+
+    # ----------------------------
+    # Update
+    # ----------------------------
+    async def _update(self, items, owner, is_admin, owners, results, changes):
+        groups = {}  # payload json -> (payload, [(index, id)])
+        for index, item in enumerate(items):
+            row_id = item.get("id")
+            if not isinstance(row_id, int):
+                results.append({"op": "update", "index": index, "status": 422, "error": "Integer id is required"})
+                continue
+            try:
+                payload = self.to_update(self.update_model.model_validate({k: v for k, v in item.items() if k != "id"}))
+            except ValidationError as e:
+                results.append({"op": "update", "index": index, "id": row_id, "status": 422, "errors": _validation_errors(e)})
+                continue
+            if not payload:
+                results.append({"op": "update", "index": index, "id": row_id, "status": 400, "error": "No fields to update"})
+                continue
+            if not self._authorize("update", index, row_id, owner, is_admin, owners, results):
+                continue
+
+            key = json.dumps(payload, sort_keys=True, default=str)
+            groups.setdefault(key, (payload, []))[1].append((index, row_id))
+
+        for payload, targets in groups.values():
+            for chunk in _chunks(targets, self.chunk_size):
+                ids = [row_id for _, row_id in chunk]
+                try:
+                    q = supabase.table(self.table).update(payload).in_("id", ids)
+                    updated = (await self._scoped(q, owner, is_admin, "update").execute()).data or []
+                except Exception as e:
+                    results.extend({"op": "update", "index": i, "id": r, "status": 500, "error": f"Update failed: {e}"} for i, r in chunk)
+                    continue
+
+                by_id = {row["id"]: row for row in updated}
+                for index, row_id in chunk:
+                    if row_id in by_id:
+                        results.append({"op": "update", "index": index, "id": row_id, "status": 200})
+                        changes["previous_owners"].add(owners[row_id])
+                    else:
+                        results.append({"op": "update", "index": index, "id": row_id, "status": 404, "error": "Not found"})
+                changes["update"].extend(updated)
+
+    # ----------------------------
+    # Delete
+    # ----------------------------
+    async def _delete(self, ids, owner, is_admin, owners, results, changes):
+        targets = [
+            (index, row_id) for index, row_id in enumerate(ids)
+            if self._authorize("delete", index, row_id, owner, is_admin, owners, results)
+        ]
+
+        for chunk in _chunks(targets, self.chunk_size):
+            # Duplicate ids in one request are deleted once
+            chunk_ids = sorted({row_id for _, row_id in chunk})
+            try:
+                q = supabase.table(self.table).delete().in_("id", chunk_ids)
+                deleted = (await self._scoped(q, owner, is_admin, "delete").execute()).data or []
+            except Exception as e:
+                results.extend({"op": "delete", "index": i, "id": r, "status": 500, "error": f"Delete failed: {e}"} for i, r in chunk)
+                continue
+
+            gone = {row["id"] for row in deleted}
+            for index, row_id in chunk:
+                if row_id in gone:
+                    results.append({"op": "delete", "index": index, "id": row_id, "status": 200})
+                else:
+                    results.append({"op": "delete", "index": index, "id": row_id, "status": 404, "error": "Not found"})
+            changes["delete"].extend(deleted)
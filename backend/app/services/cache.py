@@ -0,0 +1,150 @@
+# app/services/cache.py
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+
+from app import config
+
+_MISSING = object()
+
+
+# ----------------------------
+# Invalidation tags
+# ----------------------------
+# Owner-scoped tags ("leads:user@example.com", "deals:42") cover per-user
+# reads; the bare collection tags cover global reads such as /reports/*.
+LEADS = "leads"
+CONTACTS = "contacts"
+DEALS = "deals"
+ACTIVITIES = "activities"
+
+
+def owner_tag(collection: str, owner) -> str:
+    return f"{collection}:{owner}"
+
+
+class ResponseCache:
+    """
+    In-process LRU + TTL cache for read endpoint results.
+
+    Each entry carries a set of tags; write handlers call ``invalidate()``
+    with the tags they touched and every dependent entry is dropped. Every
+    invalidation also bumps the tag's version, so a load that overlapped a
+    write (read before it, finished after it) is returned but not cached.
+    The cache is per worker process and only ever used from the event loop,
+    so it needs no locking.
+
+    ``etag()`` is derived from the versions of a key's tags rather than from
+    the cached value, so a conditional request can be answered before the
+    entry is loaded at all. Versions only count this worker's writes, so
+    tags also carry a per-process nonce and roll over every TTL: another
+    worker never matches them, and writes made elsewhere surface within the
+    same window a cached read could be stale anyway.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> [expires_at, value, tags]
+        self._tag_index = {}  # tag -> set of keys
+        self._versions = {}  # tag -> number of invalidations so far
+        self._nonce = secrets.token_hex(8)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(route: str, owner, **params) -> tuple:
+        return (route, owner, tuple(sorted(params.items())))
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry[0], entry[1]
+        if expires_at <= time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, tags):
+        if key in self._entries:
+            self._drop(key)
+
+        tags = frozenset(tags)
+        self._entries[key] = [time.monotonic() + self.ttl_seconds, value, tags]
+        for tag in tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    async def get_or_load(self, key, tags, loader):
+        """Return the cached value for ``key`` or await ``loader()`` and cache it."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        versions = self._snapshot(tags)
+        value = await loader()
+        # A write landed while loading: the value may predate it
+        if self._snapshot(tags) == versions:
+            self.set(key, value, tags)
+        return value
+
+    def etag(self, key, tags) -> str:
+        """Strong ETag for ``key``; changes whenever one of ``tags`` is invalidated."""
+        window = int(time.time() // self.ttl_seconds) if self.ttl_seconds > 0 else 0
+        payload = repr((self._nonce, window, key, self._snapshot(tags)))
+        return '"' + hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+            for key in self._tag_index.pop(tag, ()):
+                if key in self._entries:
+                    self._drop(key)
+                    self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._tag_index.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+    def _snapshot(self, tags) -> tuple:
+        return tuple(self._versions.get(tag, 0) for tag in tags)
+
+    def _drop(self, key):
+        tags = self._entries.pop(key)[2]
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+response_cache = ResponseCache(
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.RESPONSE_CACHE_TTL
+)
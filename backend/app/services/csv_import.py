@@ -0,0 +1,125 @@
+# app/services/csv_import.py
+import asyncio
+import codecs
+import csv
+
+from postgrest.types import ReturnMethod
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.services.supabase_client import supabase
+
+
+def _decode_lines(raw):
+    """
+    Decode the upload one line at a time.
+
+    A bad byte then fails only the row it is on; TextIOWrapper decodes in
+    8 KB chunks and would lose the good rows sharing a chunk with it.
+    """
+    first = True
+    for line in raw:
+        if first:
+            line = line.removeprefix(codecs.BOM_UTF8)
+            first = False
+        yield line.decode("utf-8")
+
+
+def _read_batch(reader, model, to_record, size: int, first_row: int):
+    """
+    Parse and validate up to ``size`` CSV rows (runs in a worker thread).
+
+    Returns the valid records, the per-row errors, the next row number and,
+    if the file became unreadable, the error for the row it stopped at. The
+    rows read before that point are still returned.
+    """
+    records, errors = [], []
+    row_number = first_row
+
+    try:
+        for row in reader:
+            # Blank cells mean "not provided", not empty strings
+            data = {k: (v if v != "" else None) for k, v in row.items() if k}
+            try:
+                records.append(to_record(model.model_validate(data)))
+            except ValidationError as e:
+                errors.append({
+                    "row": row_number,
+                    "errors": [
+                        {"field": ".".join(str(p) for p in err["loc"]), "error": err["msg"]}
+                        for err in e.errors()
+                    ]
+                })
+            row_number += 1
+            if len(records) + len(errors) >= size:
+                break
+    except (UnicodeDecodeError, csv.Error) as e:
+        unreadable = {"row": row_number, "errors": [{"field": None, "error": f"Unreadable CSV: {e}"}]}
+        return records, errors, row_number, unreadable
+
+    return records, errors, row_number, None
+
+
+async def import_csv(upload, table: str, model, to_record, chunk_size: int = None, max_in_flight: int = None) -> dict:
+    """
+    Stream-import a CSV upload into ``table``.
+
+    The spooled upload is parsed incrementally, each row is validated
+    against ``model`` and turned into an insert payload by ``to_record``.
+    Valid rows are inserted ``chunk_size`` at a time with at most
+    ``max_in_flight`` inserts outstanding, so memory is bounded by
+    roughly ``chunk_size * max_in_flight`` rows whatever the file size.
+    """
+    chunk_size = chunk_size or config.IMPORT_CHUNK_SIZE
+    max_in_flight = max_in_flight or config.IMPORT_MAX_IN_FLIGHT
+
+    reader = csv.DictReader(_decode_lines(upload.file))
+
+    result = {"inserted": 0, "rejected": 0, "errors": []}
+    slots = asyncio.Semaphore(max_in_flight)
+    inserts = set()
+
+    def report(errors, rejected=None):
+        result["rejected"] += len(errors) if rejected is None else rejected
+        room = config.IMPORT_MAX_ERRORS - len(result["errors"])
+        if room > 0:
+            result["errors"].extend(errors[:room])
+
+    async def insert(records, rows):
+        try:
+            # Nothing is read back, so don't have every row echoed
+            await supabase.table(table).insert(records, returning=ReturnMethod.minimal).execute()
+            result["inserted"] += len(records)
+        except Exception as e:
+            report([{
+                "row": rows,
+                "errors": [{"field": None, "error": f"Insert failed: {e}"}]
+            }], rejected=len(records))
+        finally:
+            slots.release()
+
+    row_number = 2  # row 1 is the header
+    while True:
+        batch_start = row_number
+        records, errors, row_number, unreadable = await run_in_threadpool(
+            _read_batch, reader, model, to_record, chunk_size, row_number
+        )
+        report(errors)
+        if unreadable:
+            # Stop at the first unreadable line; rows before it still count
+            report([unreadable], rejected=0)
+
+        if records:
+            await slots.acquire()
+            task = asyncio.create_task(insert(records, f"{batch_start}-{row_number - 1}"))
+            inserts.add(task)
+            task.add_done_callback(inserts.discard)
+
+        if unreadable or row_number - batch_start < chunk_size:
+            break
+
+    if inserts:
+        await asyncio.gather(*inserts)
+
+    return result
@@ -0,0 +1,67 @@
+# app/services/export.py
+import asyncio
+import csv
+import io
+
+from app import config
+from app.services.supabase_client import supabase
+
+
+def _drain(buffer: io.StringIO) -> str:
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return chunk
+
+
+async def open_csv_export(table: str, columns: list, owner_column: str, owner, batch_size: int = None):
+    """
+    Start a constant-memory CSV export of one owner's rows.
+
+    Rows are read in keyset-paginated batches (``id > last_id``, an index
+    range scan on the (owner, id) indexes in sql/keyset_indexes.sql) and each
+    batch is written out while the next one is already being fetched, so
+    memory stays at roughly two batches regardless of table size.
+
+    The first page is awaited here so query errors surface before the
+    response starts; the returned async generator yields CSV text chunks.
+    """
+    batch_size = batch_size or config.EXPORT_BATCH_SIZE
+    select = ",".join(columns if "id" in columns else ["id", *columns])
+
+    def fetch(after_id):
+        q = supabase.table(table).select(select).eq(owner_column, owner)
+        if after_id is not None:
+            q = q.gt("id", after_id)
+        return asyncio.ensure_future(q.order("id").limit(batch_size).execute())
+
+    first_page = (await fetch(None)).data or []
+
+    async def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(columns)
+        yield _drain(buffer)
+
+        rows = first_page
+        pending = None
+        try:
+            while rows:
+                # Fetch the next page while this one is being written
+                if len(rows) == batch_size:
+                    pending = fetch(rows[-1]["id"])
+
+                for row in rows:
+                    writer.writerow([row.get(column) for column in columns])
+                yield _drain(buffer)
+
+                if pending is None:
+                    break
+                rows = (await pending).data or []
+                pending = None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    return generate()
@@ -0,0 +1,35 @@
+# app/services/kpis.py
+from app.services.supabase_client import supabase
+
+
+async def fetch_dashboard_kpis(email: str, user_id: int) -> dict:
+    """
+    Fetch an owner's dashboard KPIs in one round trip.
+
+    Counting and summing happen in the `dashboard_kpis` RPC
+    (see sql/dashboard_kpis.sql), so we never download lead or deal rows.
+    """
+    response = await supabase.rpc("dashboard_kpis", {
+        "p_owner_email": email,
+        "p_owner_id": user_id
+    }).execute()
+
+    row = response.data or {}
+
+    total_leads = int(row.get("total_leads") or 0)
+    closed_deals = int(row.get("won_deals") or 0)
+
+    conversion_rate = (
+        (closed_deals / total_leads) * 100
+        if total_leads else 0
+    )
+
+    return {
+        "total_leads": total_leads,
+        "active_leads": int(row.get("active_leads") or 0),
+        "total_deals": int(row.get("total_deals") or 0),
+        "closed_deals": closed_deals,
+        "lost_deals": int(row.get("lost_deals") or 0),
+        "total_revenue": float(row.get("total_revenue") or 0),
+        "conversion_rate": round(conversion_rate, 2)
+    }
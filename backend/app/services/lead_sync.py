@@ -0,0 +1,148 @@
+# app/services/lead_sync.py
+import asyncio
+from datetime import datetime, timedelta
+
+from postgrest.types import CountMethod, ReturnMethod
+
+from app import config
+from app.services.supabase_client import supabase
+
+# Sync source name -> external table it reads from
+SYNC_SOURCES = {
+    "external_leads": "external_leads"
+}
+
+SYNC_COLUMNS = "id,first_name,last_name,company,updated_at"
+
+
+async def get_watermark(source: str, owner_email: str):
+    result = await (
+        supabase.table("sync_watermarks")
+        .select("last_updated_at,last_id")
+        .eq("source", source)
+        .eq("owner_email", owner_email)
+        .execute()
+    )
+    row = (result.data or [None])[0]
+    if not row or row.get("last_updated_at") is None:
+        return None
+    return row["last_updated_at"], row["last_id"]
+
+
+async def save_watermark(source: str, owner_email: str, watermark):
+    await supabase.table("sync_watermarks").upsert({
+        "source": source,
+        "owner_email": owner_email,
+        "last_updated_at": watermark[0],
+        "last_id": watermark[1],
+        "synced_at": datetime.utcnow().isoformat()
+    }, on_conflict="source,owner_email", returning=ReturnMethod.minimal).execute()
+
+
+def _watermark_key(watermark):
+    return datetime.fromisoformat(watermark[0]), watermark[1]
+
+
+def _overlap_start(watermark) -> str:
+    # updated_at is stamped at transaction start, so a row can commit after
+    # later-stamped rows were synced; re-read a window behind the mark
+    updated_at = datetime.fromisoformat(watermark[0])
+    return (updated_at - timedelta(seconds=config.SYNC_OVERLAP_SECONDS)).isoformat()
+
+
+def _fetch_page(table: str, after, batch_size: int, since: str = None):
+    q = supabase.table(table).select(SYNC_COLUMNS)
+    if since is not None:
+        q = q.gte("updated_at", since)
+    elif after is not None:
+        updated_at, last_id = after
+        # (updated_at, id) > after, seekable on (updated_at, id)
+        q = q.gte("updated_at", updated_at).or_(f'updated_at.gt."{updated_at}",id.gt.{last_id}')
+    return asyncio.ensure_future(
+        q.order("updated_at").order("id").limit(batch_size).execute()
+    )
+
+
+async def sync_source(source: str, owner_email: str, batch_size: int = None) -> dict:
+    """
+    Pull rows changed since the last run from ``source`` into the owner's leads.
+
+    External rows are read in (updated_at, id) order from slightly before
+    the stored high-water mark (``SYNC_OVERLAP_SECONDS``, to catch rows
+    whose transaction committed late) and written as chunked upserts
+    keyed on (owner_email, external_source, external_id), so each run
+    costs O(changes + overlap) rather than O(table size). Rows past the
+    previous mark changed at the source and overwrite the lead; rows in
+    the overlap (and every row of a first run) are only inserted if
+    missing, so re-reading them never undoes a user's edits. ``synced``
+    counts the leads actually inserted or updated. The watermark only
+    moves forward and is saved after every chunk, so an interrupted run
+    resumes where it stopped.
+    """
+    batch_size = batch_size or config.SYNC_BATCH_SIZE
+    table = SYNC_SOURCES[source]
+
+    watermark = await get_watermark(source, owner_email)
+    previous = _watermark_key(watermark) if watermark is not None else None
+    synced = 0
+
+    since = _overlap_start(watermark) if watermark is not None else None
+    pending = _fetch_page(table, None, batch_size, since)
+    while pending is not None:
+        rows = (await pending).data or []
+        if not rows:
+            break
+
+        last = (rows[-1]["updated_at"], rows[-1]["id"])
+        if watermark is None or _watermark_key(last) > _watermark_key(watermark):
+            watermark = last
+
+        # Fetch the next page while this one is written
+        pending = _fetch_page(table, last, batch_size) if len(rows) == batch_size else None
+
+        changed, replayed = [], []
+        for row in rows:
+            record = {
+                "first_name": row.get("first_name"),
+                "last_name": row.get("last_name"),
+                "company": row.get("company"),
+                "owner_email": owner_email,
+                "external_source": source,
+                "external_id": row["id"]
+            }
+            if previous is not None and _watermark_key((row["updated_at"], row["id"])) > previous:
+                changed.append(record)
+            else:
+                replayed.append(record)
+
+        try:
+            if changed:
+                await supabase.table("leads").upsert(
+                    changed,
+                    on_conflict="owner_email,external_source,external_id",
+                    returning=ReturnMethod.minimal
+                ).execute()
+                synced += len(changed)
+            if replayed:
+                result = await supabase.table("leads").upsert(
+                    replayed,
+                    on_conflict="owner_email,external_source,external_id",
+                    ignore_duplicates=True,
+                    count=CountMethod.exact,
+                    returning=ReturnMethod.minimal
+                ).execute()
+                synced += result.count or 0
+            await save_watermark(source, owner_email, watermark)
+        except Exception:
+            if pending is not None:
+                pending.cancel()
+            raise
+
+    return {
+        "source": source,
+        "synced": synced,
+        "watermark": {
+            "updated_at": watermark[0],
+            "id": watermark[1]
+        } if watermark else None
+    }
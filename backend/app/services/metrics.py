@@ -0,0 +1,226 @@
+# app/services/metrics.py
+import bisect
+import time
+
+from app import config
+
+# Seconds; spans a cached read (~1 ms) up to a cold PDF render or export
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # label values -> value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def set(self, *labels, value: float):
+        # Mirror a running total kept elsewhere (e.g. ResponseCache.hits)
+        self._series[labels] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels, amount: float = 1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self._series[labels] = self._series.get(labels, 0) - amount
+
+    def set(self, *labels, value: float):
+        self._series[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        series = self._series.get(labels)
+        if series is None:
+            # per-bucket counts (the last slot is +Inf), sum
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    In-process Prometheus metrics, rendered in the text exposition format.
+
+    Recording is a dict lookup plus an increment (histograms add a bisect),
+    with no locks: every update happens on the event loop. Numbers are per
+    worker process; Prometheus sums them across workers. ``collect()``
+    callbacks refresh gauges that mirror other components' stats right
+    before a scrape.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames=()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def collect(self, fn):
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        for fn in self._collectors:
+            fn()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ----------------------------
+# HTTP (app/utils/request_metrics.py)
+# ----------------------------
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template, method and status.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and method.", ("method", "route")
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+# ----------------------------
+# Supabase / PostgREST (httpx event hooks on the shared client)
+# ----------------------------
+db_requests = registry.counter(
+    "supabase_requests_total", "Supabase calls by table (or rpc/<fn>), operation and status.", ("table", "operation", "status")
+)
+db_request_duration = registry.histogram(
+    "supabase_request_duration_seconds", "Supabase call latency to response headers by table and operation.", ("table", "operation")
+)
+
+# ----------------------------
+# CPU-bound work
+# ----------------------------
+bcrypt_duration = registry.histogram(
+    "bcrypt_duration_seconds", "bcrypt hash/verify time including the wait for a hasher thread.", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+bcrypt_rejected = registry.counter("bcrypt_rejected_total", "bcrypt calls refused because the queue was full.")
+pdf_render_duration = registry.histogram(
+    "pdf_render_duration_seconds", "PDF render time in the process pool, including the wait for a slot.", ("kind",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# ----------------------------
+# Admission control (app/utils/request_admission.py)
+# ----------------------------
+admission_rejected = registry.counter(
+    "admission_rejected_total", "Requests shed before routing by route class and reason.", ("route_class", "reason")
+)
+
+# ----------------------------
+# Mirrored component stats (refreshed on scrape, see app/main.py)
+# ----------------------------
+cache_entries = registry.gauge("cache_entries", "Live entries per in-process cache.", ("cache",))
+cache_lookups = registry.counter("cache_lookups_total", "Cache lookups by result.", ("cache", "result"))
+cache_evictions = registry.counter("cache_evictions_total", "Entries evicted to stay under the size limit.", ("cache",))
+bcrypt_pending = registry.gauge("bcrypt_pending", "bcrypt calls queued or running.")
+activity_queue = registry.gauge("activity_log_queued", "Activity events waiting to be flushed.")
+activity_events = registry.counter("activity_log_events_total", "Activity events by outcome.", ("outcome",))
+admission_in_flight = registry.gauge("admission_in_flight", "Admitted requests in flight per route class.", ("route_class",))
+admission_queued = registry.gauge("admission_queued", "Requests waiting for a slot per route class.", ("route_class",))
+
+
+# ----------------------------
+# httpx hooks
+# ----------------------------
+_OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+def db_target(request) -> tuple:
+    """``(table, operation)`` for a PostgREST request; RPCs are ``("rpc/<fn>", "rpc")``."""
+    table = request.url.path.split("/rest/v1/", 1)[-1].strip("/")
+    if table.startswith("rpc/"):
+        return table, "rpc"
+    operation = _OPERATIONS.get(request.method, request.method.lower())
+    if operation == "insert" and "resolution=" in request.headers.get("prefer", ""):
+        operation = "upsert"
+    return table, operation
+
+
+async def _on_db_request(request):
+    request.extensions["metrics_started"] = time.perf_counter()
+
+
+async def _on_db_response(response):
+    request = response.request
+    started = request.extensions.get("metrics_started")
+    if started is None:
+        return
+    table, operation = db_target(request)
+    db_request_duration.observe(time.perf_counter() - started, table, operation)
+    db_requests.inc(table, operation, str(response.status_code))
+
+
+def db_event_hooks() -> dict:
+    """``event_hooks`` for the shared Supabase ``httpx.AsyncClient``."""
+    if not config.METRICS_ENABLED:
+        return {}
+    return {"request": [_on_db_request], "response": [_on_db_response]}
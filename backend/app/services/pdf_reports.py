@@ -0,0 +1,193 @@
+# app/services/pdf_reports.py
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app import config
+from app.services.cache import ResponseCache
+from app.services.metrics import pdf_render_duration
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "logo.png")
+
+# Rendered PDFs are keyed by a fingerprint of their inputs, so nothing has to
+# invalidate them: changed KPIs simply produce a different key.
+pdf_cache = ResponseCache(
+    max_entries=config.PDF_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.PDF_CACHE_TTL
+)
+
+_executor = None
+_slots = asyncio.Semaphore(config.PDF_MAX_CONCURRENCY)
+_in_flight = {}  # fingerprint -> task, so identical concurrent requests render once
+
+
+# ----------------------------
+# Renderers (run in the worker processes)
+# ----------------------------
+# reportlab is imported inside the renderers, so only the PDF worker
+# processes ever load it; API workers boot without it.
+def _build_dashboard_report(kpis: dict) -> bytes:
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Title
+    elements.append(Paragraph("CRM Dashboard Report", styles["Title"]))
+    elements.append(Spacer(1, 20))
+
+    # Summary
+    elements.append(Paragraph(f"Total Leads: {kpis['total_leads']}", styles["Normal"]))
+    elements.append(Paragraph(f"Total Deals: {kpis['total_deals']}", styles["Normal"]))
+    elements.append(Paragraph(f"Closed Deals: {kpis['closed_deals']}", styles["Normal"]))
+    elements.append(Paragraph(f"Total Revenue: ₹{kpis['total_revenue']}", styles["Normal"]))
+    elements.append(Paragraph(f"Conversion Rate: {round(kpis['conversion_rate'], 2)}%", styles["Normal"]))
+
+    elements.append(Spacer(1, 20))
+
+    # KPI Table
+    data = [
+        ["Metric", "Value"],
+        ["Total Leads", kpis["total_leads"]],
+        ["Total Deals", kpis["total_deals"]],
+        ["Won Deals", kpis["closed_deals"]],
+        ["Lost Deals", kpis["lost_deals"]],
+        ["Revenue", f"₹{kpis['total_revenue']}"],
+        ["Conversion Rate", f"{round(kpis['conversion_rate'], 2)}%"],
+    ]
+
+    table = Table(data, colWidths=[250, 150])
+
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ALIGN', (1, 1), (-1, -1), 'CENTER'),
+    ]))
+
+    elements.append(table)
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def _build_crm_report(summary: dict) -> bytes:
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Logo
+    logo_path = summary.get("logo_path")
+    if logo_path:
+        logo = Image(logo_path, width=150, height=80)
+        logo.hAlign = "CENTER"
+        elements.append(logo)
+        elements.append(Spacer(1, 20))
+
+    # Title
+    elements.append(Paragraph("CRM Dashboard Report", styles["Title"]))
+    elements.append(Spacer(1, 20))
+
+    elements.append(Paragraph(f"Total Leads: {summary['total_leads']}", styles["Normal"]))
+    elements.append(Paragraph(f"Total Deals: {summary['total_deals']}", styles["Normal"]))
+    elements.append(Paragraph(f"Closed Deals: {summary['closed_deals']}", styles["Normal"]))
+    elements.append(Paragraph(f"Total Revenue: Rs {summary['total_revenue']:,.2f}", styles["Normal"]))
+    elements.append(Paragraph(f"Conversion Rate: {summary['conversion_rate']:.2f}%", styles["Normal"]))
+
+    # Page border
+    def add_border(canvas, doc):
+        canvas.saveState()
+        canvas.setStrokeColor(colors.black)
+        canvas.rect(20, 20, 550, 800)
+        canvas.restoreState()
+
+    doc.build(elements, onFirstPage=add_border, onLaterPages=add_border)
+    return buffer.getvalue()
+
+
+# ----------------------------
+# Async API (event loop side)
+# ----------------------------
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the parent runs an event loop and other thread pools
+        _executor = ProcessPoolExecutor(
+            max_workers=config.PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def fingerprint(kind: str, inputs: dict) -> str:
+    payload = json.dumps([kind, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def _render(kind: str, key: str, builder, inputs: dict) -> bytes:
+    started = time.perf_counter()
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(_get_executor(), builder, inputs)
+    pdf_render_duration.observe(time.perf_counter() - started, kind)
+    pdf_cache.set(key, pdf, ())
+    return pdf
+
+
+async def _get_or_render(kind: str, builder, inputs: dict, cache_inputs: dict = None) -> bytes:
+    key = fingerprint(kind, cache_inputs if cache_inputs is not None else inputs)
+
+    pdf = pdf_cache.get(key)
+    if pdf is not None:
+        return pdf
+
+    task = _in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_render(kind, key, builder, inputs))
+        _in_flight[key] = task
+        task.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # shield: one caller disconnecting must not cancel the shared render
+    return await asyncio.shield(task)
+
+
+async def render_dashboard_report(kpis: dict) -> bytes:
+    """Render (or reuse) the per-owner KPI report for ``kpis``."""
+    return await _get_or_render("dashboard", _build_dashboard_report, kpis)
+
+
+async def render_crm_report(summary: dict) -> bytes:
+    """Render (or reuse) the branded summary report, logo included."""
+    inputs = dict(summary)
+    cache_inputs = dict(summary)
+
+    if os.path.exists(LOGO_PATH):
+        inputs["logo_path"] = LOGO_PATH
+        # A replaced logo must produce a new fingerprint
+        stat = os.stat(LOGO_PATH)
+        cache_inputs["logo"] = [stat.st_mtime_ns, stat.st_size]
+
+    return await _get_or_render("crm", _build_crm_report, inputs, cache_inputs)
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
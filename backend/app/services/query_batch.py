@@ -0,0 +1,38 @@
+# app/services/query_batch.py
+import asyncio
+
+from app import config
+
+
+class QueryBatchTimeout(Exception):
+    """Raised when a batch does not finish in time; callers should answer 504."""
+
+
+def _to_awaitable(query):
+    # PostgREST builders are run via execute(); anything else must be awaitable
+    if hasattr(query, "execute"):
+        return query.execute()
+    return query
+
+
+async def gather_queries(*queries, timeout: float = None) -> list:
+    """
+    Run independent queries concurrently and return their results in order.
+
+    Each item is a PostgREST request builder (``supabase.table(...)...``,
+    ``supabase.rpc(...)``) or any awaitable. Latency is that of the slowest
+    query instead of the sum of all of them. If one query fails, or the
+    whole batch exceeds ``timeout`` seconds (default QUERY_BATCH_TIMEOUT),
+    the rest are cancelled and the error / QueryBatchTimeout is raised.
+    """
+    timeout = config.QUERY_BATCH_TIMEOUT if timeout is None else timeout
+    tasks = [asyncio.ensure_future(_to_awaitable(q)) for q in queries]
+
+    try:
+        return await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+    except asyncio.TimeoutError:
+        raise QueryBatchTimeout(f"{len(tasks)} queries did not finish within {timeout}s")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
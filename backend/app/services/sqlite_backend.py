@@ -0,0 +1,462 @@
+# app/services/sqlite_backend.py
+"""
+Embedded SQLite backend (DATA_BACKEND=sqlite).
+
+Plugs in underneath the postgrest-py builders as an httpx transport: the
+routes keep calling ``supabase.table(...).select(...).eq(...)`` and
+``supabase.rpc(...)`` unchanged, and each PostgREST request is answered
+in-process from a local SQLite database instead of going over the network.
+
+Supported: select/projection, eq/neq/gt/gte/lt/lte/in/is/like/ilike
+filters (with ``not.``), or=/and= groups, order, limit/offset, exact
+counts, single-object responses, insert/upsert (``on_conflict``), update,
+delete, and the RPCs under sql/. The schema lives in sql/sqlite_schema.sql.
+benchmarks/fake_postgrest.py serves the same store behind a simulated
+network.
+
+Queries run inline on the event loop over one WAL-mode connection: they
+are index lookups that finish in microseconds, well under the cost of a
+thread hop.
+"""
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "sql" / "sqlite_schema.sql"
+REST_PREFIX = "/rest/v1/"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_NON_FILTER_PARAMS = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class PostgrestError(Exception):
+    """Rendered as a PostgREST error body, which postgrest-py raises as APIError."""
+
+    def __init__(self, status: int, message: str, code: str = "PGRST100"):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def _quote(name: str) -> str:
+    return f'"{name}"'
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+def _split_top_level(text: str) -> list:
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return [p for p in parts if p]
+
+
+def _timestamp(value):
+    """Normalize a timestamp to ISO-8601 UTC text so it sorts chronologically."""
+    if not isinstance(value, str):
+        return value
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+class SQLiteStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("pragma journal_mode = wal")
+        self.conn.execute("pragma synchronous = normal")
+        self.conn.execute("pragma busy_timeout = 5000")
+        self.conn.execute("pragma temp_store = memory")
+        self.conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+
+        # table -> {column: declared type}, used to validate identifiers
+        self.columns = {}
+        self.primary_keys = {}
+        for table in self._fetch("select name from sqlite_master where type = 'table'"):
+            info = self._fetch(f"pragma table_info({_quote(table['name'])})")
+            self.columns[table["name"]] = {c["name"]: (c["type"] or "").lower() for c in info}
+            self.primary_keys[table["name"]] = [c["name"] for c in sorted(info, key=lambda c: c["pk"]) if c["pk"]]
+
+        self.rpcs = {
+            "dashboard_kpis": self._rpc_dashboard_kpis,
+            "search_leads": self._rpc_search_leads,
+            "revenue_by_month": self._rpc_revenue_by_month,
+            "top_sales_reps": self._rpc_top_sales_reps,
+            "rebuild_report_rollups": self._rpc_rebuild_report_rollups,
+        }
+        logger.info("✅ SQLite backend ready at %s", path)
+
+    def close(self):
+        self.conn.close()
+
+    def _fetch(self, sql: str, args=()) -> list:
+        cursor = self.conn.execute(sql, args)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    # ----------------------------
+    # Request handling
+    # ----------------------------
+    def handle(self, method: str, path: str, params: list, headers, body: bytes) -> tuple:
+        resource = path.split(REST_PREFIX, 1)[-1].strip("/")
+        try:
+            if resource.startswith("rpc/"):
+                args = orjson.loads(body) if body else {k: v for k, v in params if k not in _NON_FILTER_PARAMS}
+                return self._json(200, self._call_rpc(resource[4:], args))
+            return self._table_request(method, resource, params, headers, body)
+        except PostgrestError as e:
+            return self._json(e.status, {"message": str(e), "code": e.code, "details": None, "hint": None})
+        except sqlite3.IntegrityError as e:
+            code = "23505" if "UNIQUE" in str(e) else "23502" if "NOT NULL" in str(e) else "23000"
+            return self._json(409, {"message": str(e), "code": code, "details": None, "hint": None})
+        except sqlite3.Error as e:
+            return self._json(400, {"message": str(e), "code": "XX000", "details": None, "hint": None})
+
+    def _json(self, status: int, data, extra: dict = None) -> tuple:
+        headers = {"content-type": "application/json; charset=utf-8", **(extra or {})}
+        return status, headers, orjson.dumps(data)
+
+    def _table_request(self, method, table, params, headers, body) -> tuple:
+        if table not in self.columns:
+            raise PostgrestError(404, f'relation "public.{table}" does not exist', "42P01")
+
+        prefer = headers.get("prefer", "")
+        options = dict(params)
+        select = self._select(table, options.get("select", "*"))
+
+        if method in ("GET", "HEAD"):
+            return self._read(table, params, options, select, headers, head=method == "HEAD")
+
+        if method == "POST":
+            payload = orjson.loads(body)
+            rows = payload if isinstance(payload, list) else [payload]
+            on_conflict = options.get("on_conflict")
+            if on_conflict is None and "resolution=" in prefer:
+                on_conflict = ",".join(self.primary_keys[table])
+            written = self._insert(table, rows, on_conflict, "ignore-duplicates" in prefer)
+            status = 201
+        elif method == "PATCH":
+            written = self._update(table, params, orjson.loads(body))
+            status = 200
+        elif method == "DELETE":
+            where, args = self._where(table, params)
+            written = self._fetch(f"delete from {_quote(table)}{where} returning *", args)
+            status = 200
+        else:
+            raise PostgrestError(405, f"method {method} not allowed", "PGRST117")
+
+        # Rows actually written: with ignore-duplicates, skipped rows are not counted
+        extra = {"content-range": f"*/{len(written)}"} if "count=" in prefer else {}
+        if "return=minimal" in prefer:
+            return (201 if method == "POST" else 204), extra, b""
+        if select != "*":
+            keep = [c.strip('"') for c in select.split(",")]
+            written = [{c: row.get(c) for c in keep} for row in written]
+        return self._json(status, written, extra)
+
+    # ----------------------------
+    # Reads
+    # ----------------------------
+    def _read(self, table, params, options, select, headers, head=False) -> tuple:
+        where, args = self._where(table, params)
+        order = self._order(table, options.get("order"))
+        limit = int(options["limit"]) if "limit" in options else -1
+        offset = int(options.get("offset", 0))
+
+        rows = self._fetch(
+            f"select {select} from {_quote(table)}{where}{order} limit ? offset ?",
+            [*args, limit, offset]
+        )
+
+        total = "*"
+        if "count=" in headers.get("prefer", ""):
+            total = self._fetch(f"select count(*) as n from {_quote(table)}{where}", args)[0]["n"]
+        content_range = f"{offset}-{offset + len(rows) - 1}/{total}" if rows else f"*/{total}"
+
+        if head:
+            return 200, {"content-range": content_range}, b""
+        if "vnd.pgrst.object" in headers.get("accept", ""):
+            if len(rows) != 1:
+                raise PostgrestError(406, "JSON object requested, multiple (or no) rows returned", "PGRST116")
+            return self._json(200, rows[0], {"content-range": content_range})
+        return self._json(200, rows, {"content-range": content_range})
+
+    def _column(self, table: str, name: str) -> str:
+        if not _IDENTIFIER.match(name) or name not in self.columns[table]:
+            raise PostgrestError(400, f"column {table}.{name} does not exist", "42703")
+        return _quote(name)
+
+    def _value(self, table: str, column: str, value):
+        return _timestamp(value) if self.columns[table].get(column) == "timestamptz" else value
+
+    def _select(self, table: str, select: str) -> str:
+        if select.strip() == "*":
+            return "*"
+        return ",".join(self._column(table, c.strip()) for c in select.split(",") if c.strip())
+
+    def _order(self, table: str, order: str) -> str:
+        if not order:
+            return ""
+        terms = []
+        for term in order.split(","):
+            column, *flags = term.split(".")
+            direction = "desc" if "desc" in flags else "asc"
+            # SQLite sorts NULLs as the smallest value; spelling that default
+            # out (desc.nullslast, asc.nullsfirst) would keep the (created
+            # desc, id desc) indexes from serving the ORDER BY, so only the
+            # opposite placement gets a NULLS clause
+            nulls = ""
+            if direction == "desc" and "nullsfirst" in flags:
+                nulls = " nulls first"
+            elif direction == "asc" and "nullslast" in flags:
+                nulls = " nulls last"
+            terms.append(f"{self._column(table, column)} {direction}{nulls}")
+        return " order by " + ", ".join(terms)
+
+    def _where(self, table: str, params: list) -> tuple:
+        clauses, args = [], []
+        for key, value in params:
+            if key in _NON_FILTER_PARAMS:
+                continue
+            if key in ("or", "and"):
+                sql, group_args = self._group(table, key, value)
+            else:
+                op, _, operand = value.partition(".")
+                sql, group_args = self._condition(table, key, op, operand)
+            clauses.append(sql)
+            args.extend(group_args)
+        return (" where " + " and ".join(clauses) if clauses else ""), args
+
+    def _group(self, table: str, kind: str, expression: str) -> tuple:
+        clauses, args = [], []
+        for part in _split_top_level(expression.strip()[1:-1]):
+            nested = re.match(r"^(not\.)?(and|or)(\(.*\))$", part)
+            if nested:
+                sql, nested_args = self._group(table, nested.group(2), nested.group(3))
+                sql = f"not {sql}" if nested.group(1) else sql
+            else:
+                column, op, operand = (part.split(".", 2) + ["", ""])[:3]
+                sql, nested_args = self._condition(table, column, op, operand)
+            clauses.append(sql)
+            args.extend(nested_args)
+        return "(" + f" {kind} ".join(clauses) + ")", args
+
+    def _condition(self, table: str, column: str, op: str, operand: str) -> tuple:
+        negate = op == "not"
+        if negate:
+            op, _, operand = operand.partition(".")
+        col = self._column(table, column)
+
+        if op == "is":
+            literal = {"null": "null", "true": "1", "false": "0"}.get(operand.lower())
+            if literal is None:
+                raise PostgrestError(400, f"invalid is. value: {operand}")
+            sql, args = f"{col} is {literal}", []
+        elif op == "in":
+            items = [self._value(table, column, _unquote(v)) for v in _split_top_level(operand.strip("()"))]
+            sql, args = f"{col} in ({','.join('?' * len(items))})", items
+        elif op == "ilike":
+            # SQLite's LIKE is case-insensitive for ASCII, like Postgres ILIKE
+            sql, args = f"{col} like ?", [_unquote(operand).replace("*", "%")]
+        elif op == "like":
+            pattern = _unquote(operand).replace("*", "%")
+            sql, args = f"{col} glob ?", [pattern.replace("%", "*").replace("_", "?")]
+        elif op in _OPERATORS:
+            sql, args = f"{col} {_OPERATORS[op]} ?", [self._value(table, column, _unquote(operand))]
+        else:
+            raise PostgrestError(400, f"unsupported operator: {op}")
+
+        return (f"not ({sql})" if negate else sql), args
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def _insert(self, table: str, rows: list, on_conflict: str, ignore_duplicates: bool) -> list:
+        keys = [self._column(table, k.strip()) for k in on_conflict.split(",")] if on_conflict else []
+
+        written = []
+        self.conn.execute("begin immediate")
+        try:
+            for row in rows:
+                columns = [self._column(table, c) for c in row]
+                values = [self._value(table, c, v) for c, v in row.items()]
+                if not columns:
+                    sql = f"insert into {_quote(table)} default values"
+                else:
+                    sql = f"insert into {_quote(table)} ({','.join(columns)}) values ({','.join('?' * len(columns))})"
+
+                if keys:
+                    updates = [c for c in columns if c not in keys]
+                    action = "nothing" if ignore_duplicates or not updates else "update set " + ",".join(f"{c} = excluded.{c}" for c in updates)
+                    sql += f" on conflict ({','.join(keys)}) do {action}"
+
+                written.extend(self._fetch(sql + " returning *", values))
+            self.conn.execute("commit")
+        except BaseException:
+            self.conn.execute("rollback")
+            raise
+        return written
+
+    def _update(self, table: str, params: list, changes: dict) -> list:
+        if not changes:
+            raise PostgrestError(400, "Empty update payload")
+        assignments = ",".join(f"{self._column(table, c)} = ?" for c in changes)
+        values = [self._value(table, c, v) for c, v in changes.items()]
+        where, args = self._where(table, params)
+        return self._fetch(
+            f"update {_quote(table)} set {assignments}{where} returning *", [*values, *args]
+        )
+
+    # ----------------------------
+    # RPCs (equivalents of the Postgres functions)
+    # ----------------------------
+    def _call_rpc(self, fn: str, args: dict):
+        if fn not in self.rpcs:
+            raise PostgrestError(404, f"Could not find the function public.{fn}", "PGRST202")
+        try:
+            return self.rpcs[fn](**args)
+        except TypeError:
+            raise PostgrestError(404, f"Could not find the function public.{fn}({', '.join(args)})", "PGRST202")
+
+    def _rpc_dashboard_kpis(self, p_owner_email, p_owner_id) -> dict:
+        leads = self._fetch(
+            """
+            select count(*) as total_leads,
+                   count(*) filter (where status is not null and lower(status) <> 'lost') as active_leads
+            from leads where owner_email = ?
+            """,
+            [p_owner_email]
+        )[0]
+        deals = self._fetch(
+            """
+            select count(*) as total_deals,
+                   count(*) filter (where lower(stage) = 'won') as won_deals,
+                   count(*) filter (where lower(stage) = 'lost') as lost_deals,
+                   coalesce(sum(value) filter (where lower(stage) = 'won'), 0) as total_revenue
+            from deals where owner_id = ?
+            """,
+            [p_owner_id]
+        )[0]
+        return {**leads, **deals}
+
+    def _rpc_search_leads(self, p_owner_email, p_query, p_status=None, p_limit=100, p_offset=0) -> list:
+        # Same token semantics as sql/lead_search.sql; relevance is the number
+        # of tokens that start a word instead of trigram word_similarity
+        document = "lower(coalesce(first_name,'') || ' ' || coalesce(last_name,'') || ' ' || coalesce(company,'') || ' ' || coalesce(email,''))"
+        clauses, args, score, score_args = [], [], [], []
+        for token in (p_query or "").lower().split():
+            escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append(f"{document} like ? escape '\\'")
+            args.append(f"%{escaped}%")
+            score.append(f"(({document} like ? escape '\\') or ({document} like ? escape '\\'))")
+            score_args.extend([f"{escaped}%", f"% {escaped}%"])
+
+        where = " and ".join(["owner_email = ?", "(? is null or status = ?)", *clauses])
+        relevance = " + ".join(score) or "0"
+        return self._fetch(
+            f"""
+            select * from leads where {where}
+            order by ({relevance}) desc, created desc, id desc
+            limit ? offset ?
+            """,
+            [p_owner_email, p_status, p_status, *args, *score_args, p_limit, p_offset]
+        )
+
+    def _rpc_revenue_by_month(self) -> list:
+        return self._fetch(
+            """
+            select strftime('%Y-%m', close_date) as month, sum(value) as total_sales
+            from deals
+            where stage = 'won' and close_date is not null
+            group by 1 order by 1
+            """
+        )
+
+    def _rpc_top_sales_reps(self) -> list:
+        return self._fetch(
+            """
+            select coalesce(u.name, u.email, 'User ' || d.owner_id) as rep_name, sum(d.value) as total_sales
+            from deals d left join users u on u.id = d.owner_id
+            where d.stage = 'won'
+            group by d.owner_id
+            order by total_sales desc
+            limit 5
+            """
+        )
+
+    def _rpc_rebuild_report_rollups(self, p_apply=True) -> list:
+        actual = """
+            select 'leads_total' as metric, '' as dim, count(*) as value from leads
+            union all select 'deals_total', '', count(*) from deals
+            union all select 'deals_won', '', count(*) filter (where stage = 'won') from deals
+            union all select 'deals_by_stage', coalesce(stage, ''), count(*) from deals group by 2
+        """
+        self.conn.execute("begin immediate")
+        try:
+            drift = self._fetch(
+                f"""
+                with actual as ({actual}),
+                keys as (select metric, dim from actual union select metric, dim from report_rollups)
+                select k.metric, k.dim, coalesce(s.value, 0) as stored, coalesce(a.value, 0) as actual
+                from keys k
+                left join actual a on a.metric = k.metric and a.dim = k.dim
+                left join report_rollups s on s.metric = k.metric and s.dim = k.dim
+                where coalesce(s.value, 0) <> coalesce(a.value, 0)
+                """
+            )
+            if p_apply:
+                self.conn.execute("delete from report_rollups")
+                self.conn.execute(f"insert into report_rollups (metric, dim, value) select metric, dim, value from ({actual})")
+            self.conn.execute("commit")
+        except BaseException:
+            self.conn.execute("rollback")
+            raise
+        return drift
+
+
+class SQLiteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that answers PostgREST requests from a ``SQLiteStore``."""
+
+    def __init__(self, path: str):
+        self.store = SQLiteStore(path)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status, headers, content = self.store.handle(
+            request.method,
+            request.url.path,
+            request.url.params.multi_items(),
+            request.headers,
+            await request.aread()
+        )
+        return httpx.Response(status, headers=headers, content=content)
+
+    async def aclose(self):
+        self.store.close()
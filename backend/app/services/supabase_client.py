@@ -1,9 +1,13 @@
 # app/services/supabase_client.py
-from supabase import create_client, Client
+from postgrest import AsyncPostgrestClient
+import httpx
 import os
 from dotenv import load_dotenv
 import logging
 
+from app import config
+from app.services import metrics, tracing
+
 # Load environment variables
 load_dotenv(dotenv_path=".env")
 
@@ -13,6 +17,13 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 # Logger setup
 logger = logging.getLogger(__name__)
 
+if config.DATA_BACKEND == "sqlite":
+    # Requests never leave the process; the URL only shapes request paths
+    SUPABASE_URL = SUPABASE_URL or "http://sqlite.local"
+    SUPABASE_KEY = SUPABASE_KEY or "sqlite"
+elif config.DATA_BACKEND != "supabase":
+    raise Exception(f"❌ Unknown DATA_BACKEND: {config.DATA_BACKEND} (expected supabase or sqlite)")
+
 # Validate credentials
 if not SUPABASE_URL or not SUPABASE_KEY:
     missing = []
@@ -22,10 +33,82 @@ if not SUPABASE_URL or not SUPABASE_KEY:
         missing.append("SUPABASE_KEY")
     raise Exception(f"❌ Missing Supabase credentials: {', '.join(missing)}")
 
-# Create Supabase client
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    logger.info("✅ Supabase client initialized successfully")
-except Exception as e:
-    logger.error(f"❌ Failed to initialize Supabase client: {e}")
-    raise
+
+class AsyncSupabase:
+    """
+    Async PostgREST data-access layer.
+
+    Exposes the same ``table()`` / ``rpc()`` builders the routes already use,
+    but every ``execute()`` is awaitable and all requests share one pooled
+    HTTP/2 ``httpx.AsyncClient``, so a single worker can keep many Supabase
+    calls in flight without blocking the event loop.
+    """
+
+    def __init__(self, url: str, key: str):
+        self.rest_url = f"{url.rstrip('/')}/rest/v1"
+        self.headers = {
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        self._postgrest = None
+
+    def _create_session(self) -> httpx.AsyncClient:
+        if config.DATA_BACKEND == "sqlite":
+            from app.services.sqlite_backend import SQLiteTransport
+
+            return httpx.AsyncClient(
+                base_url=self.rest_url,
+                headers=self.headers,
+                transport=SQLiteTransport(config.SQLITE_PATH)
+            )
+
+        return httpx.AsyncClient(
+            base_url=self.rest_url,
+            headers=self.headers,
+            http2=config.SUPABASE_HTTP2,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=config.SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=config.SUPABASE_MAX_KEEPALIVE,
+                keepalive_expiry=config.SUPABASE_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                config.SUPABASE_READ_TIMEOUT,
+                connect=config.SUPABASE_CONNECT_TIMEOUT,
+                pool=config.SUPABASE_POOL_TIMEOUT,
+            ),
+        )
+
+    @property
+    def postgrest(self) -> AsyncPostgrestClient:
+        if self._postgrest is None:
+            session = self._create_session()
+            # Per-table call metrics and request traces, whichever transport backs the session
+            for source in (metrics.db_event_hooks(), tracing.db_event_hooks()):
+                for event, hooks in source.items():
+                    session.event_hooks[event].extend(hooks)
+            self._postgrest = AsyncPostgrestClient(
+                self.rest_url,
+                headers=self.headers,
+                http_client=session
+            )
+            logger.info("✅ Supabase connection pool initialized")
+        return self._postgrest
+
+    def table(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    def rpc(self, fn: str, params: dict = None):
+        return self.postgrest.rpc(fn, params or {})
+
+    async def aclose(self):
+        if self._postgrest is not None:
+            await self._postgrest.session.aclose()
+            self._postgrest = None
+            logger.info("Supabase connection pool closed")
+
+
+# Shared async client used by every router
+supabase = AsyncSupabase(SUPABASE_URL, SUPABASE_KEY)
@@ -0,0 +1,126 @@
+# app/services/tracing.py
+import contextvars
+import time
+from collections import Counter
+
+import orjson
+
+from app import config
+from app.services.metrics import db_target
+
+# The trace of the request being served; None outside a request (startup,
+# the activity-log flusher), so those calls are never attributed to one.
+_current = contextvars.ContextVar("request_trace", default=None)
+
+
+class QueryTrace:
+    __slots__ = ("table", "operation", "status", "rows", "bytes", "duration")
+
+    def __init__(self, table, operation, status, rows, bytes, duration):
+        self.table = table
+        self.operation = operation
+        self.status = status
+        self.rows = rows
+        self.bytes = bytes
+        self.duration = duration
+
+
+class RequestTrace:
+    """
+    Every Supabase round trip issued while serving one request.
+
+    Child tasks (``asyncio.gather`` fan-out, the response cache's loaders)
+    inherit the context, so they append to the same trace. Durations run to
+    the end of the response body and overlap for concurrent queries, so
+    ``db_time`` can exceed the request's wall time.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def summary(self) -> str:
+        # "leads select x5, deals update x1": repeated shapes first, so N+1 loops stand out
+        shapes = Counter((query.table, query.operation) for query in self.queries)
+        return ", ".join(f"{table} {operation} x{count}" for (table, operation), count in shapes.most_common())
+
+    def server_timing(self, total: float) -> str:
+        entries = [f'db;dur={self.db_time * 1000:.1f};desc="round_trips={self.round_trips}"']
+        for i, query in enumerate(self.queries[:config.TRACE_MAX_TIMINGS], 1):
+            rows = "?" if query.rows is None else query.rows
+            desc = f"{query.table} {query.operation} {query.status} rows={rows} bytes={query.bytes}"
+            entries.append(f'db{i};dur={query.duration * 1000:.1f};desc="{desc}"')
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def activate(trace: RequestTrace):
+    return _current.set(trace)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+# ----------------------------
+# httpx hooks
+# ----------------------------
+def _row_count(response):
+    # PostgREST reports the returned range on reads: "0-24/*" is 25 rows
+    returned = response.headers.get("content-range", "").partition("/")[0]
+    if "-" in returned:
+        first, last = returned.split("-", 1)
+        return int(last) - int(first) + 1
+
+    # Writes with return=representation carry no range; count the body
+    body = response.content.lstrip()
+    if not body:
+        return 0
+    if body[:1] == b"[":
+        try:
+            return len(orjson.loads(body))
+        except orjson.JSONDecodeError:
+            return None
+    if body[:1] == b"{":
+        return 1
+    return None
+
+
+async def _on_db_request(request):
+    if _current.get() is not None:
+        request.extensions["trace_started"] = time.perf_counter()
+
+
+async def _on_db_response(response):
+    trace = _current.get()
+    request = response.request
+    started = request.extensions.get("trace_started")
+    if trace is None or started is None:
+        return
+
+    # The client reads the body right after the hooks anyway; reading it
+    # here lets the trace include transfer time and the size
+    await response.aread()
+    table, operation = db_target(request)
+    trace.queries.append(QueryTrace(
+        table,
+        operation,
+        response.status_code,
+        _row_count(response) if response.is_success else 0,
+        len(response.content),
+        time.perf_counter() - started
+    ))
+
+
+def db_event_hooks() -> dict:
+    """``event_hooks`` for the shared Supabase ``httpx.AsyncClient``."""
+    if not config.TRACING_ENABLED:
+        return {}
+    return {"request": [_on_db_request], "response": [_on_db_response]}
@@ -0,0 +1,38 @@
+# app/utils/conditional.py
+from fastapi import Request, Response
+
+ETAG_HEADER = "ETag"
+
+# Browsers keep per-user copies and revalidate on every poll
+_CACHE_HEADERS = {
+    "Cache-Control": "private, no-cache",
+    "Vary": "Authorization",
+}
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_response(request: Request, response: Response, etag: str):
+    """
+    Attach ``etag`` to ``response``; return a 304 if the client already has it.
+
+    Handlers check this before loading and return the 304 as-is, so the
+    query and serialization are both skipped.
+    """
+    if etag is None:
+        return None
+
+    headers = {ETAG_HEADER: etag, **_CACHE_HEADERS}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
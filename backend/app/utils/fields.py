@@ -0,0 +1,37 @@
+# app/utils/fields.py
+from typing import Optional
+
+from fastapi import HTTPException
+
+FIELDS_DESCRIPTION = "Comma-separated columns to return (e.g. first_name,company,status)"
+# List endpoints: the selection makes each row a partial view of the response schema
+LIST_FIELDS_DESCRIPTION = (
+    f"{FIELDS_DESCRIPTION}. Rows then carry only those columns plus the ids and sort keys "
+    "paging needs; the other fields of the response schema, required ones included, are omitted."
+)
+
+
+def parse_fields(fields: Optional[str], allowed, always=("id",)) -> Optional[list]:
+    """
+    Validate a ``fields=a,b,c`` parameter against ``allowed`` column names.
+
+    Returns None when no selection was requested (callers select "*"),
+    otherwise the requested columns plus ``always`` (ids and sort keys the
+    handler needs for cursors), de-duplicated and in a stable order.
+    """
+    if not fields:
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+
+    return list(dict.fromkeys([*always, *requested]))
+
+
+def select_clause(columns: Optional[list]) -> str:
+    return ",".join(columns) if columns else "*"
@@ -1,8 +1,13 @@
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import os
+import time
+import logging
 from dotenv import load_dotenv
 
+from app import config
+
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -12,6 +17,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 120  # increase to 2 hours
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY not found in .env")
 
+logger = logging.getLogger(__name__)
+
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -27,5 +34,43 @@ def verify_token(token: str):
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
     except JWTError as e:
-        print("❌ JWT Error:", str(e))
-        return None
\ No newline at end of file
+        logger.info("JWT rejected: %s", e)
+        return None
+
+
+class TokenCache:
+    """
+    Bounded LRU of values derived from verified tokens.
+
+    Each entry expires at its token's ``exp`` claim, so a cached token is
+    never honoured longer than the token itself would be.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # token -> (exp, value)
+
+    def get(self, token: str):
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+
+        exp, value = entry
+        if exp <= time.time():
+            del self._entries[token]
+            return None
+
+        self._entries.move_to_end(token)
+        return value
+
+    def put(self, token: str, value, exp: float):
+        self._entries[token] = (exp, value)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+principal_cache = TokenCache(config.TOKEN_CACHE_SIZE)
@@ -0,0 +1,57 @@
+# app/utils/pagination.py
+import base64
+import json
+
+from fastapi import HTTPException
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Response header carrying the total row count (first page only)
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(sort_value, row_id) -> str:
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_cursor(q, cursor: str, column: str = "created", desc: bool = True):
+    """
+    Restrict ``q`` to rows after ``cursor`` in (column, id) order.
+
+    ``column`` may be NULL: ``order_by_cursor`` sorts NULLs as the smallest
+    value (last when descending), and a cursor taken on such a row carries
+    an explicit null, so those rows are neither skipped nor repeated. Pair
+    with ``order_by_cursor``.
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    op = "lt" if desc else "gt"
+
+    if sort_value is None:
+        if desc:
+            return q.is_(column, None).lt("id", row_id)
+        return q.or_(f"{column}.not.is.null,and({column}.is.null,id.gt.{row_id})")
+
+    after = f'{column}.{op}."{sort_value}",and({column}.eq."{sort_value}",id.{op}.{row_id})'
+    return q.or_(f"{after},{column}.is.null" if desc else after)
+
+
+def order_by_cursor(q, column: str = "created", desc: bool = True):
+    # Postgres sorts NULLs first under DESC by default; keep them at the end
+    return q.order(column, desc=desc, nullsfirst=not desc).order("id", desc=desc)
+
+
+def next_cursor(rows: list, limit: int, column: str = "created"):
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(last.get(column), last.get("id"))
@@ -0,0 +1,76 @@
+# app/utils/passwords.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app import config
+from app.services.metrics import bcrypt_duration, bcrypt_rejected
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the bcrypt queue is full; callers should answer 503."""
+
+
+# bcrypt releases the GIL, so a dedicated thread pool gives real
+# parallelism without borrowing threads from FastAPI's shared threadpool.
+_executor = ThreadPoolExecutor(
+    max_workers=config.BCRYPT_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+_pending = 0
+
+
+async def _submit(operation: str, fn, *args):
+    global _pending
+
+    # Fail fast instead of letting a login burst queue up unbounded work
+    if _pending >= config.BCRYPT_MAX_PENDING:
+        bcrypt_rejected.inc()
+        raise PasswordHasherBusy()
+
+    _pending += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+        bcrypt_duration.observe(time.perf_counter() - started, operation)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def hash_password(password: str) -> str:
+    return await _submit("hash", _hash, password, config.BCRYPT_ROUNDS)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _submit("verify", _verify, password, hashed)
+
+
+def hash_cost(hashed: str) -> int:
+    # "$2b$12$<salt+hash>" -> 12
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def needs_rehash(hashed: str) -> bool:
+    return hash_cost(hashed) != config.BCRYPT_ROUNDS
+
+
+def pending() -> int:
+    return _pending
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
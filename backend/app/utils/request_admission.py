@@ -0,0 +1,85 @@
+# app/utils/request_admission.py
+import math
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from app import config
+from app.services import admission
+from app.services.metrics import admission_rejected
+from app.utils.jwt_handler import principal_cache, verify_token
+
+# Never shed the scrape that would show the shedding
+EXEMPT_PATHS = {"/metrics"}
+
+
+def _subject(scope):
+    """JWT subject of the caller, or None for anonymous and invalid tokens."""
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    # Verified before: the routes already resolved this token
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal.email
+
+    # Verify the signature so nobody can spend another user's budget
+    payload = verify_token(token)
+    return payload.get("sub") if payload else None
+
+
+def _reject(status: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI middleware that sheds load before any route work starts.
+
+    Each authenticated user has a token bucket keyed by the JWT subject;
+    heavy and CPU-bound routes cost more tokens than ordinary ones, and an
+    empty bucket answers ``429``. Every route class also has a per-worker
+    concurrency cap with a short queue; when that is full the request gets
+    ``503``. Both carry ``Retry-After``. One user hammering exports or PDFs
+    then runs out of tokens or heavy slots instead of starving everyone
+    else's cheap reads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = admission.classify(scope["method"], scope["path"])
+        cost = admission.COSTS[route_class]
+
+        user = _subject(scope) if config.ADMISSION_USER_RATE > 0 else None
+        if user is not None:
+            wait = admission.user_buckets.take(user, cost)
+            if wait:
+                admission_rejected.inc(route_class, "user_rate")
+                response = _reject(429, "Too many requests, please slow down", wait)
+                await response(scope, receive, send)
+                return
+
+        gate = admission.gates[route_class]
+        if not await gate.acquire():
+            if user is not None:
+                admission.user_buckets.refund(user, cost)
+            admission_rejected.inc(route_class, "overloaded")
+            response = _reject(503, "Server busy, please retry", config.ADMISSION_RETRY_AFTER)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,45 @@
+# app/utils/request_metrics.py
+import time
+
+from app.services.metrics import http_requests, http_request_duration, http_in_flight
+
+# Label for requests that matched no route, so 404 scans can't explode the series count
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight count per
+    route template (``/deals/{deal_id}``, not the concrete path).
+
+    FastAPI puts the matched route in ``scope["route"]`` during routing, so
+    it is read after the app returns. Latency runs until the last body
+    chunk is sent, which for streamed exports includes the whole stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], template)
+            http_requests.inc(scope["method"], template, str(status))
@@ -0,0 +1,54 @@
+# app/utils/request_tracing.py
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+
+from app import config
+from app.services import tracing
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTracingMiddleware:
+    """
+    Pure ASGI middleware that traces the Supabase round trips of each request.
+
+    The trace is added to the response as a ``Server-Timing`` header (visible
+    in the browser's network panel) and, when a request goes over
+    ``TRACE_ROUND_TRIP_BUDGET``, logged as a warning with a per-table
+    breakdown. Streamed responses send their headers first, so queries made
+    while streaming only show up in the warning.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = tracing.RequestTrace()
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(SERVER_TIMING_HEADER, trace.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        token = tracing.activate(trace)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            tracing.deactivate(token)
+            budget = config.TRACE_ROUND_TRIP_BUDGET
+            if budget and trace.round_trips > budget:
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                logger.warning(
+                    "%s %s made %d Supabase round trips (budget %d): %s",
+                    scope["method"], route, trace.round_trips, budget, trace.summary()
+                )
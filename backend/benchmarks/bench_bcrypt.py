@@ -0,0 +1,70 @@
+# benchmarks/bench_bcrypt.py
+"""
+Login (bcrypt verify) throughput: inline vs the dedicated hashing pool.
+
+Run from backend/:
+
+    BCRYPT_ROUNDS=12 BCRYPT_WORKERS=4 python -m benchmarks.bench_bcrypt --logins 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import bcrypt
+
+from app import config
+from app.utils import passwords
+
+
+def bench_inline(hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    for _ in range(logins):
+        bcrypt.checkpw(b"correct horse", hashed.encode("utf-8"))
+    return time.perf_counter() - start
+
+
+async def bench_pool(hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        passwords.verify_password("correct horse", hashed) for _ in range(logins)
+    ))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    # Keep the whole burst inside the queue limit
+    config.BCRYPT_MAX_PENDING = max(config.BCRYPT_MAX_PENDING, args.logins)
+
+    hashed = bcrypt.hashpw(b"correct horse", bcrypt.gensalt(config.BCRYPT_ROUNDS)).decode("utf-8")
+    cores = min(config.BCRYPT_WORKERS, os.cpu_count() or 1)
+
+    inline = bench_inline(hashed, args.logins)
+    pooled = asyncio.run(bench_pool(hashed, args.logins))
+    passwords.shutdown()
+
+    results = {
+        "rounds": config.BCRYPT_ROUNDS,
+        "workers": config.BCRYPT_WORKERS,
+        "cores_used": cores,
+        "logins": args.logins,
+        "inline_logins_per_sec": round(args.logins / inline, 2),
+        "pool_logins_per_sec": round(args.logins / pooled, 2),
+        "pool_logins_per_sec_per_core": round(args.logins / pooled / cores, 2),
+        "ms_per_verify": round(inline / args.logins * 1000, 2)
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/bench_lead_search.py
+"""
+Lead search latency: legacy four-column ILIKE scan vs the search_leads RPC.
+
+Seeding writes up to millions of leads, so this only runs against a
+dedicated benchmark project given explicitly with --supabase-url and
+--supabase-key (or BENCH_SUPABASE_URL / BENCH_SUPABASE_KEY), never the
+project in .env; it refuses to start if the two match. Apply
+sql/lead_search.sql to that project first. All benchmark rows belong to
+a dedicated owner.
+
+    export BENCH_SUPABASE_URL=https://<bench-project>.supabase.co BENCH_SUPABASE_KEY=...
+
+    # small volumes: seed through PostgREST
+    python -m benchmarks.bench_lead_search --seed 50000
+
+    # large volumes: print SQL for the bench project's SQL editor / psql, e.g. 10M rows
+    python -m benchmarks.bench_lead_search --emit-seed-sql 10000000
+
+    python -m benchmarks.bench_lead_search --repeat 20 --json search.json
+    python -m benchmarks.bench_lead_search --cleanup
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from functools import partial
+
+from dotenv import dotenv_values
+
+OWNER = "bench+search@example.com"
+
+FIRST_NAMES = ["john", "ava", "liam", "mia", "noah", "emma", "arjun", "priya", "lucas", "sofia", "omar", "chen"]
+LAST_NAMES = ["doe", "patel", "smith", "garcia", "kumar", "nguyen", "muller", "rossi", "khan", "silva", "tanaka"]
+COMPANIES = ["acme", "globex", "initech", "umbrella", "hooli", "stark", "wayne", "wonka", "cyberdyne", "tyrell"]
+DOMAINS = ["gmail.com", "outlook.com", "acme.io", "example.org"]
+
+QUERIES = ["patel", "acme", "john smith", "wonka kumar", "outlook", "zzz-no-match"]
+
+
+def make_lead(rng: random.Random, n: int) -> dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "first_name": first.title(),
+        "last_name": last.title(),
+        "company": rng.choice(COMPANIES).title(),
+        "email": f"{first}.{last}{n}@{rng.choice(DOMAINS)}",
+        "status": rng.choice(["new", "contacted", "qualified", "lost"]),
+        "owner_email": OWNER,
+    }
+
+
+def seed_sql(rows: int) -> str:
+    def arr(values):
+        return "array[" + ",".join(f"'{v}'" for v in values) + "]"
+
+    return f"""-- Run this against the dedicated benchmark project only
+insert into leads (first_name, last_name, company, email, status, owner_email)
+select
+  initcap(({arr(FIRST_NAMES)})[1 + (g * 7) % {len(FIRST_NAMES)}]),
+  initcap(({arr(LAST_NAMES)})[1 + (g * 13) % {len(LAST_NAMES)}]),
+  initcap(({arr(COMPANIES)})[1 + (g * 17) % {len(COMPANIES)}]),
+  ({arr(FIRST_NAMES)})[1 + (g * 7) % {len(FIRST_NAMES)}] || '.' ||
+    ({arr(LAST_NAMES)})[1 + (g * 13) % {len(LAST_NAMES)}] || g || '@' ||
+    ({arr(DOMAINS)})[1 + (g * 3) % {len(DOMAINS)}],
+  (array['new','contacted','qualified','lost'])[1 + g % 4],
+  '{OWNER}'
+from generate_series(1, {rows}) as g;
+analyze leads;"""
+
+
+async def seed(supabase, rows: int, chunk: int = 1000, concurrency: int = 8):
+    rng = random.Random(42)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def insert(start):
+        async with slots:
+            batch = [make_lead(rng, n) for n in range(start, min(start + chunk, rows))]
+            await supabase.table("leads").insert(batch).execute()
+
+    await asyncio.gather(*(insert(start) for start in range(0, rows, chunk)))
+
+
+async def ilike_search(supabase, query: str, limit: int):
+    like = f"%{query}%"
+    return await (
+        supabase.table("leads").select("*").eq("owner_email", OWNER)
+        .or_(f"first_name.ilike.{like},last_name.ilike.{like},company.ilike.{like},email.ilike.{like}")
+        .order("created", desc=True).limit(limit).execute()
+    )
+
+
+async def rpc_search(supabase, query: str, limit: int):
+    return await supabase.rpc("search_leads", {
+        "p_owner_email": OWNER, "p_query": query, "p_limit": limit
+    }).execute()
+
+
+async def measure(fn, query: str, limit: int, repeat: int) -> dict:
+    await fn(query, limit)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await fn(query, limit)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "rows": len(result.data or []),
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)], 2)
+    }
+
+
+async def run(args, supabase):
+    try:
+        if args.cleanup:
+            await supabase.table("leads").delete().eq("owner_email", OWNER).execute()
+            print(f"Deleted benchmark leads for {OWNER}")
+            return
+        if args.seed:
+            await seed(supabase, args.seed)
+            print(f"Seeded {args.seed} leads for {OWNER}")
+
+        results = {}
+        for query in QUERIES:
+            results[query] = {
+                "ilike": await measure(partial(ilike_search, supabase), query, args.limit, args.repeat),
+                "search_leads": await measure(partial(rpc_search, supabase), query, args.limit, args.repeat)
+            }
+
+        print(json.dumps(results, indent=2))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+    finally:
+        await supabase.aclose()
+
+
+def _same_project(a: str, b: str) -> bool:
+    return bool(a and b) and a.strip().rstrip("/").lower() == b.strip().rstrip("/").lower()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--supabase-url", default=os.getenv("BENCH_SUPABASE_URL"), help="dedicated benchmark project URL")
+    parser.add_argument("--supabase-key", default=os.getenv("BENCH_SUPABASE_KEY"), help="service key of that project")
+    parser.add_argument("--seed", type=int, default=0, help="insert this many benchmark leads first")
+    parser.add_argument("--emit-seed-sql", type=int, metavar="ROWS", help="print seeding SQL and exit")
+    parser.add_argument("--cleanup", action="store_true", help="delete the benchmark leads and exit")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.emit_seed_sql:
+        print(seed_sql(args.emit_seed_sql))
+        return
+
+    if not args.supabase_url or not args.supabase_key:
+        parser.error("a dedicated benchmark project is required: pass --supabase-url and --supabase-key")
+    app_env = dotenv_values(".env")
+    for url in (app_env.get("SUPABASE_URL"), os.getenv("SUPABASE_URL")):
+        if _same_project(args.supabase_url, url):
+            parser.error(f"{args.supabase_url} is the app's own project (SUPABASE_URL); use a dedicated benchmark project")
+    for key in (app_env.get("SUPABASE_KEY"), os.getenv("SUPABASE_KEY")):
+        if key and args.supabase_key == key:
+            parser.error("--supabase-key is the app's own SUPABASE_KEY; use a dedicated benchmark project")
+
+    # The client reads its settings at import time, and load_dotenv never overrides them
+    os.environ["DATA_BACKEND"] = "supabase"
+    os.environ["SUPABASE_URL"] = args.supabase_url
+    os.environ["SUPABASE_KEY"] = args.supabase_key
+    from app.services.supabase_client import supabase
+
+    asyncio.run(run(args, supabase))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_query_batch.py
+"""
+Independent queries awaited one after another vs gather_queries().
+
+No database needed: the shared Supabase client is pointed at an in-process
+transport that answers every request after --latency-ms, which stands in
+for the network round trip to Supabase.
+
+Run from backend/:
+
+    python -m benchmarks.bench_query_batch --latency-ms 40 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import httpx
+
+from app.services.supabase_client import supabase
+from app.services.query_batch import gather_queries
+
+# Query shapes of handlers that used to run their queries back to back
+SCENARIOS = {
+    # the legacy /reports/conversion-rate: three exact counts
+    "conversion_rate_counts": lambda: [
+        supabase.table("leads").select("id", count="exact"),
+        supabase.table("deals").select("id", count="exact"),
+        supabase.table("deals").select("id", count="exact").eq("stage", "won"),
+    ],
+    # /reports/generate-report: rollup counters + revenue by month
+    "reports_generate_report": lambda: [
+        supabase.table("report_rollups").select("metric,value").in_("metric", ["leads_total", "deals_total", "deals_won"]),
+        supabase.rpc("revenue_by_month"),
+    ],
+}
+
+
+def install_fake_transport(latency_ms: float, jitter_ms: float):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep((latency_ms + random.uniform(0, jitter_ms)) / 1000)
+        return httpx.Response(200, json=[], headers={"content-range": "0-0/0"})
+
+    supabase._create_session = lambda: httpx.AsyncClient(
+        base_url=supabase.rest_url,
+        headers=supabase.headers,
+        transport=httpx.MockTransport(handler)
+    )
+
+
+async def run_sequential(build) -> float:
+    start = time.perf_counter()
+    for query in build():
+        await query.execute()
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_batched(build) -> float:
+    start = time.perf_counter()
+    await gather_queries(*build())
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+    }
+
+
+async def bench(repeat: int) -> dict:
+    results = {}
+    for name, build in SCENARIOS.items():
+        sequential = [await run_sequential(build) for _ in range(repeat)]
+        batched = [await run_batched(build) for _ in range(repeat)]
+        results[name] = {
+            "queries": len(build()),
+            "sequential": summarize(sequential),
+            "batched": summarize(batched),
+            "speedup_p50": round(statistics.median(sequential) / statistics.median(batched), 2),
+        }
+    await supabase.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    install_fake_transport(args.latency_ms, args.jitter_ms)
+
+    results = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "repeat": args.repeat,
+        "scenarios": asyncio.run(bench(args.repeat)),
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
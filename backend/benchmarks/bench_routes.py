@@ -0,0 +1,317 @@
+# benchmarks/bench_routes.py
+"""
+End-to-end route benchmark: boots the app in-process against the seeded
+PostgREST fake (benchmarks/fake_postgrest.py) and drives each route at the
+given concurrency levels, reporting throughput and p50/p95/p99 latency.
+
+Every app -> Supabase round trip pays --latency-ms (+ up to --jitter-ms),
+so the numbers reflect how many round trips a route makes and how well it
+overlaps them, as well as the app's own CPU time. The fake runs on the
+same event loop, so its (small) query cost is included too.
+
+Run from backend/:
+
+    python -m benchmarks.bench_routes --latency-ms 20 --concurrency 1,10,50 --json bench.json
+    python -m benchmarks.bench_routes --latency-ms 20 --concurrency 1,10,50 --compare bench.json
+
+--backend sqlite serves the same seeded data from the embedded SQLite
+backend (DATA_BACKEND=sqlite) instead; --latency-ms does not apply there.
+
+--compare prints the change against an earlier run (e.g. from the previous
+commit) and exits non-zero when a p95 regresses by more than --threshold.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# The app reads its settings at import time; never let a benchmark reach a real project
+os.environ.setdefault("SUPABASE_URL", "http://fake-postgrest.local")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+# A handful of users at full speed would spend their rate limits in the first second
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+from benchmarks.fake_postgrest import BENCH_PASSWORD, FakePostgrest
+
+HEAVY = {"login", "leads_export", "contacts_export", "deals_export", "leads_import", "dashboard_pdf", "reports_pdf"}
+
+
+def import_csv(rows: int, run: int) -> bytes:
+    lines = ["first_name,last_name,company,email,phone,source,status,notes"]
+    for n in range(rows):
+        lines.append(f"Bench,Import{n},Acme,bench.import.{run}.{n}@example.com,+91-9000000000,Website,new,Imported")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def build_scenarios(args) -> dict:
+    """name -> async fn(client, ctx, n) returning an httpx.Response."""
+    def get(path, **params):
+        async def call(client, ctx, n):
+            return await client.get(path, params=params or None, headers=ctx["auth"])
+        return call
+
+    async def login(client, ctx, n):
+        return await client.post("/auth/login", data={"email": ctx["email"], "password": BENCH_PASSWORD})
+
+    async def leads_search(client, ctx, n):
+        terms = ["patel", "acme", "ava smith", "globex 1", "khan"]
+        return await client.get("/leads/", params={"search": terms[n % len(terms)], "limit": 50}, headers=ctx["auth"])
+
+    async def leads_next_page(client, ctx, n):
+        return await client.get("/leads/", params={"limit": 100, "cursor": ctx["leads_cursor"]}, headers=ctx["auth"])
+
+    async def leads_revalidate(client, ctx, n):
+        headers = {**ctx["auth"], "If-None-Match": ctx.get("leads_etag") or ""}
+        return await client.get("/leads/", params={"limit": 100}, headers=headers)
+
+    async def leads_import(client, ctx, n):
+        files = {"file": ("leads.csv", import_csv(args.import_rows, n), "text/csv")}
+        return await client.post("/leads/import", files=files, headers=ctx["auth"])
+
+    def export(path):
+        async def call(client, ctx, n):
+            # Drain the stream so the whole export is timed
+            async with client.stream("GET", path, headers=ctx["auth"]) as response:
+                async for _ in response.aiter_bytes():
+                    pass
+            return response
+        return call
+
+    return {
+        "login": login,
+        "leads_list": get("/leads/", limit=100),
+        "leads_list_fields": get("/leads/", limit=100, fields="first_name,last_name,company,status"),
+        "leads_next_page": leads_next_page,
+        "leads_revalidate": leads_revalidate,
+        "leads_search": leads_search,
+        "contacts_list": get("/contacts/", limit=100),
+        "deals_list": get("/deals/", limit=100),
+        "deals_list_filtered": get("/deals/", limit=100, stage="won", min_value=50000),
+        "leads_export": export("/leads/export"),
+        "contacts_export": export("/contacts/export"),
+        "deals_export": export("/deals/export"),
+        "leads_import": leads_import,
+        "dashboard_stats": get("/dashboard/stats"),
+        "dashboard_activities": get("/dashboard/activities"),
+        "reports_deals_by_stage": get("/reports/deals-by-stage"),
+        "reports_revenue_by_month": get("/reports/revenue-by-month"),
+        "reports_top_sales": get("/reports/top-sales"),
+        "reports_conversion_rate": get("/reports/conversion-rate"),
+        "dashboard_pdf": get("/dashboard/generate-report"),
+        "reports_pdf": get("/reports/generate-report"),
+    }
+
+
+def percentile(ordered: list, pct: float) -> float:
+    # Nearest-rank percentile over a sorted list
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+async def run_level(client, ctx, call, concurrency: int, total: int) -> dict:
+    latencies, statuses = [], {}
+    pending = iter(range(total))
+
+    async def worker():
+        for n in pending:
+            start = time.perf_counter()
+            try:
+                response = await call(client, ctx, n)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "statuses": {str(k): v for k, v in statuses.items()},
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+async def bench(args, fake) -> list:
+    import httpx
+    from app.main import app
+
+    scenarios = build_scenarios(args)
+    selected = [s.strip() for s in args.scenarios.split(",")] if args.scenarios else list(scenarios)
+    unknown = [s for s in selected if s not in scenarios]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)}. Known: {', '.join(scenarios)}")
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # Log in as a Sales rep (rep0 is the Admin)
+            ctx = {"email": "rep1@bench.local"}
+            login = await client.post("/auth/login", data={"email": ctx["email"], "password": BENCH_PASSWORD})
+            login.raise_for_status()
+            ctx["auth"] = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+            first = await client.get("/leads/", params={"limit": 100}, headers=ctx["auth"])
+            first.raise_for_status()
+            ctx["leads_cursor"] = first.headers.get("x-next-cursor")
+            ctx["leads_etag"] = first.headers.get("etag")
+
+            for name in selected:
+                call = scenarios[name]
+                total = args.heavy_requests if name in HEAVY else args.requests
+                for _ in range(args.warmup):
+                    await call(client, ctx, -1)
+
+                for concurrency in args.concurrency:
+                    fake.requests.clear()
+                    level = await run_level(client, ctx, call, concurrency, total)
+                    level["scenario"] = name
+                    if args.backend == "fake":
+                        level["db_round_trips_per_request"] = round(sum(fake.requests.values()) / total, 2)
+                    results.append(level)
+                    print(
+                        f"{name:<26} c={concurrency:<4} {level['throughput_rps']:>9.1f} req/s  "
+                        f"p50 {level['p50_ms']:>8.2f}  p95 {level['p95_ms']:>8.2f}  p99 {level['p99_ms']:>8.2f} ms"
+                        + (f"  errors {level['errors']} {level['statuses']}" if level["errors"] else ""),
+                        flush=True
+                    )
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline_path: str, threshold: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(r["scenario"], r["concurrency"]): r for r in baseline["results"]}
+
+    print(f"\nvs {baseline_path} (commit {baseline.get('commit')}):")
+    if baseline.get("settings") != report["settings"]:
+        print("warning: the baseline was recorded with different settings; ratios are not like for like")
+    regressed = False
+    for r in report["results"]:
+        old = before.get((r["scenario"], r["concurrency"]))
+        if not old:
+            continue
+        p95_ratio = r["p95_ms"] / old["p95_ms"] if old["p95_ms"] else 1.0
+        rps_ratio = r["throughput_rps"] / old["throughput_rps"] if old["throughput_rps"] else 1.0
+        flag = "  REGRESSION" if p95_ratio > threshold else ""
+        regressed = regressed or bool(flag)
+        print(
+            f"{r['scenario']:<26} c={r['concurrency']:<4} p95 {old['p95_ms']:>8.2f} -> {r['p95_ms']:>8.2f} ms "
+            f"({p95_ratio:.2f}x)  throughput {rps_ratio:.2f}x{flag}"
+        )
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["fake", "sqlite"], default="fake")
+    parser.add_argument("--sqlite-path", default="bench.sqlite3", help="database file for --backend sqlite (recreated)")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--concurrency", type=lambda s: [int(c) for c in s.split(",")], default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and concurrency level")
+    parser.add_argument("--heavy-requests", type=int, default=40, help="requests for login, export, import and PDF scenarios")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--scenarios", help="comma-separated subset of scenarios")
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--contacts", type=int, default=10000)
+    parser.add_argument("--deals", type=int, default=5000)
+    parser.add_argument("--activities", type=int, default=20000)
+    parser.add_argument("--owners", type=int, default=50)
+    parser.add_argument("--import-rows", type=int, default=200)
+    parser.add_argument("--no-cache", action="store_true", help="disable the response and PDF caches")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p95 ratio counted as a regression")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+        os.environ["PDF_CACHE_MAX_ENTRIES"] = "0"
+    if args.backend == "sqlite":
+        os.environ["DATA_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = args.sqlite_path
+
+    import bcrypt
+    from app import config
+    from app.services.supabase_client import supabase
+
+    # One log line per request would dominate the timings
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.backend == "sqlite":
+        # Seed the database file the app's own SQLite backend then opens
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.sqlite_path + suffix):
+                os.remove(args.sqlite_path + suffix)
+        fake = FakePostgrest(path=args.sqlite_path)
+    else:
+        fake = FakePostgrest(args.latency_ms, args.jitter_ms)
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(config.BCRYPT_ROUNDS)).decode()
+    fake.seed(args.leads, args.contacts, args.deals, args.activities, args.owners, password_hash)
+    if args.backend == "sqlite":
+        fake.close()
+    else:
+        fake.install(supabase)
+
+    results = asyncio.run(bench(args, fake))
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "settings": {
+            "backend": args.backend,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "requests": args.requests,
+            "heavy_requests": args.heavy_requests,
+            "cache": not args.no_cache,
+            "bcrypt_rounds": config.BCRYPT_ROUNDS,
+            "seed": {
+                "leads": args.leads, "contacts": args.contacts, "deals": args.deals,
+                "activities": args.activities, "owners": args.owners,
+            },
+        },
+        "results": results,
+    }
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare and compare(report, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_serialization.py
+"""
+Per-row cost of turning a page of DB rows into a JSON response body.
+
+  response_model: what FastAPI does for `response_model=List[Lead]` etc. —
+                  validate every row (EmailStr included), dump it, then
+                  render with the stdlib json encoder.
+  rows_response:  app.utils.responses.rows_response — project rows onto the
+                  model's fields and render with orjson, no re-validation.
+
+No database needed. Run from backend/:
+
+    python -m benchmarks.bench_serialization --rows 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.lead import Lead
+from app.models.contact import Contact
+from app.models.deals import Deal
+from app.utils.responses import rows_response
+
+
+def lead_row(n: int) -> dict:
+    return {
+        "id": n, "first_name": "Ava", "last_name": f"Patel{n}", "company": "Acme Corp",
+        "email": f"ava.patel{n}@example.com", "phone": "+91-9876543210", "source": "Website",
+        "status": "qualified", "notes": "Interested in a demo next quarter. " * 4,
+        "created": "2025-08-16T10:00:00+00:00", "owner_email": "owner@example.com",
+    }
+
+
+def contact_row(n: int) -> dict:
+    return {
+        "id": n, "first_name": "Liam", "last_name": f"Khan{n}", "email": f"liam.khan{n}@example.com",
+        "phone": "+91-9876543210", "company": "Globex", "job_title": "Manager", "notes": "Met at expo",
+        "created": "2025-08-16T10:00:00+00:00", "owner_email": "owner@example.com",
+    }
+
+
+def deal_row(n: int) -> dict:
+    return {
+        "id": n, "title": f"Renewal {n}", "company": "Initech", "value": 125000.5, "stage": "proposal",
+        "lead_id": n, "owner_id": 7, "close_date": "2025-09-30", "notes": "Needs legal review",
+        "created_at": "2025-08-16T10:00:00+00:00", "updated_at": "2025-08-17T10:00:00+00:00",
+    }
+
+
+MODELS = {"leads": (Lead, lead_row), "contacts": (Contact, contact_row), "deals": (Deal, deal_row)}
+
+
+def time_response_model(model, rows, loop) -> float:
+    field = create_model_field("Response", List[model], mode="serialization")
+
+    start = time.perf_counter()
+    content = loop.run_until_complete(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    JSONResponse(content=content)
+    return time.perf_counter() - start
+
+
+def time_rows_response(model, rows) -> float:
+    start = time.perf_counter()
+    rows_response(rows, model.model_fields, Response())
+    return time.perf_counter() - start
+
+
+def per_row_us(samples: list, rows: int) -> float:
+    return round(statistics.median(samples) / rows * 1e6, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {"rows": args.rows, "repeat": args.repeat, "collections": {}}
+    loop = asyncio.new_event_loop()
+    for name, (model, make_row) in MODELS.items():
+        rows = [make_row(n) for n in range(args.rows)]
+        before = [time_response_model(model, rows, loop) for _ in range(args.repeat)]
+        after = [time_rows_response(model, rows) for _ in range(args.repeat)]
+
+        results["collections"][name] = {
+            "response_model_us_per_row": per_row_us(before, args.rows),
+            "rows_response_us_per_row": per_row_us(after, args.rows),
+            "speedup": round(statistics.median(before) / statistics.median(after), 1),
+            "page_ms_before": round(statistics.median(before) * 1000, 2),
+            "page_ms_after": round(statistics.median(after) * 1000, 2),
+        }
+
+    loop.close()
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
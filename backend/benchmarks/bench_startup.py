@@ -0,0 +1,132 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start budget: how long `import app.main` takes and how much RSS a fresh
+worker holds once the app is built.
+
+Each run boots a new interpreter with `-X importtime`, so module caches from
+earlier runs never flatter the numbers. Exits non-zero when the median import
+time or RSS goes over budget, or when a module that should load lazily
+(reportlab, matplotlib, ...) shows up at boot.
+
+Run from backend/:
+
+    python -m benchmarks.bench_startup --runs 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported when a report is actually requested
+LAZY_MODULES = ["reportlab", "matplotlib", "PIL"]
+
+_BOOT = """
+import json, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+rss_kb = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({"boot_ms": elapsed * 1000, "rss_kb": rss_kb}))
+"""
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def boot_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _BOOT],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["modules"] = modules
+    return result
+
+
+def top_packages(modules: dict, limit: int) -> list:
+    # Attribute self time to the top-level package that owns each module
+    totals = {}
+    for name, (self_us, _) in modules.items():
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"package": name, "self_ms": round(us / 1000, 2)} for name, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="packages to list by import time")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "2500")))
+    parser.add_argument("--budget-rss-mb", type=float, default=float(os.getenv("STARTUP_BUDGET_RSS_MB", "150")))
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    runs = [boot_once() for _ in range(args.runs)]
+
+    boot_ms = statistics.median(run["boot_ms"] for run in runs)
+    rss_mb = statistics.median(run["rss_kb"] for run in runs) / 1024
+    last = runs[-1]["modules"]
+
+    loaded_lazy = sorted({
+        name.split(".")[0] for name in last
+        if name.split(".")[0] in LAZY_MODULES
+    })
+
+    app_modules = {
+        name: round(cumulative / 1000, 2)
+        for name, (_, cumulative) in last.items()
+        if name.startswith("app.")
+    }
+
+    failures = []
+    if boot_ms > args.budget_ms:
+        failures.append(f"boot took {boot_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if rss_mb > args.budget_rss_mb:
+        failures.append(f"RSS is {rss_mb:.1f} MB (budget {args.budget_rss_mb:.0f} MB)")
+    if loaded_lazy:
+        failures.append(f"lazy modules imported at boot: {', '.join(loaded_lazy)}")
+
+    results = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "boot_ms_median": round(boot_ms, 1),
+        "boot_ms_runs": [round(run["boot_ms"], 1) for run in runs],
+        "rss_mb_median": round(rss_mb, 1),
+        "modules_imported": len(last),
+        "top_packages": top_packages(last, args.top),
+        "app_modules_cumulative_ms": dict(sorted(app_modules.items(), key=lambda item: item[1], reverse=True)),
+        "lazy_modules_loaded": loaded_lazy,
+        "budget": {"boot_ms": args.budget_ms, "rss_mb": args.budget_rss_mb},
+        "failures": failures
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failures:
+        sys.exit("startup budget exceeded: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# benchmarks/fake_postgrest.py
+"""
+In-memory stand-in for the Supabase PostgREST API, for benchmarks.
+
+Answers requests with the embedded SQLite backend
+(app/services/sqlite_backend.py), so it implements exactly the PostgREST
+subset and RPCs that DATA_BACKEND=sqlite does, over seeded tables, with a
+configurable delay per request standing in for the network round trip.
+
+Two ways to use it:
+
+    # in-process: route the shared client through the fake
+    fake = FakePostgrest(latency_ms=20)
+    fake.seed(leads=20000)
+    fake.install(supabase)
+
+    # standalone: serve it over HTTP and point SUPABASE_URL at it
+    python -m benchmarks.fake_postgrest --port 54321 --latency-ms 20 --leads 20000
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl
+
+import httpx
+
+from app.services.sqlite_backend import REST_PREFIX, SQLiteStore
+
+FIRST_NAMES = ["John", "Ava", "Liam", "Mia", "Noah", "Emma", "Arjun", "Priya", "Lucas", "Sofia", "Omar", "Chen"]
+LAST_NAMES = ["Doe", "Patel", "Smith", "Garcia", "Kumar", "Nguyen", "Muller", "Rossi", "Khan", "Silva", "Tanaka"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Cyberdyne", "Tyrell"]
+LEAD_STATUSES = ["new", "contacted", "qualified", "lost"]
+DEAL_STAGES = ["new", "qualified", "proposal", "negotiation", "won", "lost"]
+NOTES = "Interested in a demo next quarter; follow up after budget review. "
+
+BENCH_PASSWORD = "bench-password"
+
+
+class FakePostgrest:
+    """
+    ``SQLiteStore`` behind a simulated network: the same PostgREST subset
+    and RPCs as DATA_BACKEND=sqlite, plus a delay per request and a count
+    of requests per resource.
+    """
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, seed: int = 7, path: str = ":memory:"):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+        self.store = SQLiteStore(path)
+        self.requests = Counter()
+
+    def close(self):
+        self.store.close()
+
+    # ----------------------------
+    # Wiring
+    # ----------------------------
+    def install(self, client):
+        """Send every request of an ``AsyncSupabase`` client to this fake."""
+        client._create_session = lambda: httpx.AsyncClient(
+            base_url=client.rest_url,
+            headers=client.headers,
+            transport=_Transport(self)
+        )
+
+    async def __call__(self, scope, receive, send):
+        # Minimal ASGI app so the fake can also be served by uvicorn
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        status, out_headers, content = await self.handle(scope["method"], scope["path"], query, headers, body)
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in out_headers.items()]
+        })
+        await send({"type": "http.response.body", "body": content})
+
+    async def handle(self, method: str, path: str, query: list, headers: dict, body: bytes) -> tuple:
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep((self.latency_ms + self.rng.uniform(0, self.jitter_ms)) / 1000)
+
+        resource = path.split(REST_PREFIX, 1)[-1].strip("/")
+        self.requests[f"{method} {resource}"] += 1
+        return self.store.handle(method, path, query, headers, body)
+
+    # ----------------------------
+    # Seeding
+    # ----------------------------
+    def seed(self, leads=20000, contacts=10000, deals=5000, activities=20000, owners=50, password_hash=None) -> list:
+        """
+        Fill the tables with realistic rows spread over ``owners`` users.
+        Returns the seeded users; all share ``BENCH_PASSWORD`` (pass its
+        bcrypt hash as ``password_hash`` to make /auth/login work).
+        """
+        rng = self.rng
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        def stamp(n, total):
+            # Spread rows over a year, oldest first
+            return (start + timedelta(seconds=int(n * 365 * 86400 / max(total, 1)))).isoformat()
+
+        rows = {table: [] for table in ("users", "leads", "contacts", "deals", "activities")}
+        for n in range(owners):
+            rows["users"].append({
+                "email": f"rep{n}@bench.local",
+                "password": password_hash,
+                "role": "Admin" if n == 0 else "Sales",
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "profile_pic": None,
+            })
+        users = self.store._insert("users", rows.pop("users"), None, False)
+
+        for n in range(leads):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows["leads"].append({
+                "first_name": first, "last_name": last,
+                "company": f"{rng.choice(COMPANIES)} {rng.randint(1, 500)}",
+                "email": f"{first.lower()}.{last.lower()}{n}@example.com",
+                "phone": f"+91-98{rng.randint(10000000, 99999999)}",
+                "source": rng.choice(["Website", "Referral", "Event", "Cold call"]),
+                "status": rng.choice(LEAD_STATUSES),
+                "notes": NOTES * rng.randint(0, 6),
+                "created": stamp(n, leads),
+                "owner_email": users[n % owners]["email"],
+            })
+
+        for n in range(contacts):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            rows["contacts"].append({
+                "first_name": first, "last_name": last,
+                "email": f"{first.lower()}.{last.lower()}{n}@contact.example.com",
+                "phone": f"+91-97{rng.randint(10000000, 99999999)}",
+                "company": rng.choice(COMPANIES), "job_title": rng.choice(["Manager", "Director", "Engineer", "VP Sales"]),
+                "notes": NOTES * rng.randint(0, 3),
+                "created": stamp(n, contacts),
+                "owner_email": users[n % owners]["email"],
+            })
+
+        for n in range(deals):
+            created = stamp(n, deals)
+            rows["deals"].append({
+                "title": f"{rng.choice(COMPANIES)} deal {n}", "company": rng.choice(COMPANIES),
+                "value": round(rng.uniform(1000, 250000), 2), "stage": rng.choice(DEAL_STAGES),
+                "lead_id": rng.randint(1, max(leads, 1)), "owner_id": users[n % owners]["id"],
+                "close_date": created[:10], "notes": NOTES * rng.randint(0, 2),
+                "created_at": created, "updated_at": created,
+            })
+
+        for n in range(activities):
+            rows["activities"].append({
+                "user_email": users[n % owners]["email"],
+                "type": rng.choice(["lead_created", "lead_updated", "deal_created", "deal_won"]),
+                "message": "Seeded activity",
+                "amount": None,
+                "created_at": stamp(n, activities),
+            })
+
+        for table, items in rows.items():
+            self.store._insert(table, items, None, False)
+        return users
+
+
+class _Transport(httpx.AsyncBaseTransport):
+    def __init__(self, fake: FakePostgrest):
+        self.fake = fake
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        status, headers, content = await self.fake.handle(
+            request.method,
+            request.url.path,
+            request.url.params.multi_items(),
+            {k.lower(): v for k, v in request.headers.items()},
+            body
+        )
+        return httpx.Response(status, headers=headers, content=content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--leads", type=int, default=20000)
+    parser.add_argument("--contacts", type=int, default=10000)
+    parser.add_argument("--deals", type=int, default=5000)
+    parser.add_argument("--activities", type=int, default=20000)
+    parser.add_argument("--owners", type=int, default=50)
+    args = parser.parse_args()
+
+    import bcrypt
+    import uvicorn
+    from app import config
+
+    fake = FakePostgrest(args.latency_ms, args.jitter_ms)
+    password_hash = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(config.BCRYPT_ROUNDS)).decode()
+    fake.seed(args.leads, args.contacts, args.deals, args.activities, args.owners, password_hash)
+    print(f"Users rep0..rep{args.owners - 1}@bench.local, password {BENCH_PASSWORD!r}")
+    print(f"Point the app at it: SUPABASE_URL=http://{args.host}:{args.port}")
+    uvicorn.run(fake, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# backend/rebuild_rollups.py
+"""
+Recompute the /reports counters (sql/report_rollups.sql) from the base tables.
+
+    python rebuild_rollups.py           # rebuild and print any drift found
+    python rebuild_rollups.py --check   # only report drift; exit 1 if any
+"""
+import argparse
+import asyncio
+import sys
+
+from app.services.supabase_client import supabase
+
+
+async def rebuild(apply: bool) -> list:
+    try:
+        response = await supabase.rpc("rebuild_report_rollups", {"p_apply": apply}).execute()
+        return response.data or []
+    finally:
+        await supabase.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="report drift without rewriting the counters")
+    args = parser.parse_args()
+
+    drift = asyncio.run(rebuild(apply=not args.check))
+
+    if not drift:
+        print("Rollups are consistent with the base tables")
+        return
+
+    print(f"{len(drift)} counter(s) drifted:")
+    for row in drift:
+        dim = f"[{row['dim']}]" if row["dim"] else ""
+        print(f"  {row['metric']}{dim}: stored={row['stored']} actual={row['actual']}")
+
+    if args.check:
+        sys.exit(1)
+    # API workers pick the new values up once their cached reports expire
+    print("Counters rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+-- backend/sql/dashboard_kpis.sql
+-- Per-owner dashboard KPIs computed inside Postgres so only a handful of
+-- numbers cross the wire. Called via supabase.rpc("dashboard_kpis", ...).
+
+create index if not exists leads_owner_email_status_idx on leads (owner_email, status);
+create index if not exists deals_owner_id_stage_idx on deals (owner_id, stage);
+
+create or replace function dashboard_kpis(p_owner_email text, p_owner_id bigint)
+returns json
+language sql
+stable
+as $$
+  select json_build_object(
+    'total_leads', l.total_leads,
+    'active_leads', l.active_leads,
+    'total_deals', d.total_deals,
+    'won_deals', d.won_deals,
+    'lost_deals', d.lost_deals,
+    'total_revenue', d.total_revenue
+  )
+  from (
+    select
+      count(*) as total_leads,
+      count(*) filter (where status is not null and lower(status) <> 'lost') as active_leads
+    from leads
+    where owner_email = p_owner_email
+  ) l,
+  (
+    select
+      count(*) as total_deals,
+      count(*) filter (where lower(stage) = 'won') as won_deals,
+      count(*) filter (where lower(stage) = 'lost') as lost_deals,
+      coalesce(sum(value) filter (where lower(stage) = 'won'), 0) as total_revenue
+    from deals
+    where owner_id = p_owner_id
+  ) d;
+$$;
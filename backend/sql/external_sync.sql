@@ -0,0 +1,70 @@
+-- backend/sql/external_sync.sql
+-- Incremental external lead sync (POST /dashboard/sync-data).
+
+-- 1. Change tracking on the external source
+alter table external_leads add column if not exists updated_at timestamptz not null default now();
+create index if not exists external_leads_updated_id_idx on external_leads (updated_at, id);
+
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  new.updated_at := now();
+  return new;
+end;
+$$;
+
+drop trigger if exists external_leads_touch_updated_at on external_leads;
+create trigger external_leads_touch_updated_at
+  before update on external_leads
+  for each row execute function touch_updated_at();
+
+-- 2. Natural key for upserts: which external row a lead came from
+alter table leads add column if not exists external_source text;
+alter table leads add column if not exists external_id bigint;
+create unique index if not exists leads_external_key_idx
+  on leads (owner_email, external_source, external_id);
+
+-- 3. Per-source, per-owner high-water marks
+create table if not exists sync_watermarks (
+  source text not null,
+  owner_email text not null,
+  last_updated_at timestamptz,
+  last_id bigint,
+  synced_at timestamptz not null default now(),
+  primary key (source, owner_email)
+);
+
+-- 4. Link leads created by the earlier full-table sync, which copied
+--    first_name/last_name/company without recording the source row, so the
+--    first incremental run updates them instead of inserting duplicates.
+--    Each lead is linked to at most one external row and each external row
+--    to at most one lead per owner; anything ambiguous is left alone and
+--    gets its own lead on the next sync. Safe to re-run.
+with candidates as (
+  select distinct on (l.id) l.id as lead_id, l.owner_email, e.id as external_id
+  from leads l
+  join external_leads e
+    on l.first_name is not distinct from e.first_name
+   and l.last_name is not distinct from e.last_name
+   and l.company is not distinct from e.company
+  where l.external_id is null
+  order by l.id, e.id
+),
+matches as (
+  select distinct on (c.owner_email, c.external_id) c.lead_id, c.external_id
+  from candidates c
+  where not exists (
+    select 1 from leads o
+    where o.owner_email = c.owner_email
+      and o.external_source = 'external_leads'
+      and o.external_id = c.external_id
+  )
+  order by c.owner_email, c.external_id, c.lead_id
+)
+update leads l
+set external_source = 'external_leads',
+    external_id = m.external_id
+from matches m
+where l.id = m.lead_id;
@@ -0,0 +1,19 @@
+-- backend/sql/keyset_indexes.sql
+-- Indexes backing cursor pagination on (created, id) for leads and contacts
+-- and (created_at, id) for deals.
+-- app/utils/pagination.py orders NULL timestamps last, so the indexes do too
+-- (they replace the earlier nulls-first *_owner_created_id_idx ones).
+
+drop index if exists leads_owner_created_id_idx;
+drop index if exists contacts_owner_created_id_idx;
+drop index if exists deals_owner_created_id_idx;
+create index if not exists leads_owner_created_nulls_last_idx on leads (owner_email, created desc nulls last, id desc);
+create index if not exists contacts_owner_created_nulls_last_idx on contacts (owner_email, created desc nulls last, id desc);
+create index if not exists deals_owner_created_nulls_last_idx on deals (owner_id, created_at desc nulls last, id desc);
+create index if not exists deals_owner_close_date_idx on deals (owner_id, close_date);
+
+-- CSV exports page by id within one owner (app/services/export.py), so each
+-- batch is an index range scan rather than a sort of all the owner's rows.
+create index if not exists leads_owner_id_idx on leads (owner_email, id);
+create index if not exists contacts_owner_id_idx on contacts (owner_email, id);
+create index if not exists deals_owner_id_id_idx on deals (owner_id, id);
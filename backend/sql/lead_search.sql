@@ -0,0 +1,57 @@
+-- backend/sql/lead_search.sql
+-- Indexed, relevance-ranked lead search used by GET /leads/?search=...
+--
+-- The search document is an expression over first/last name, company and
+-- email with a trigram GIN index on it. Postgres maintains the index on
+-- every insert/update (create, update, CSV import, sync), so there is no
+-- separate indexing job. Each query token becomes a LIKE '%token%' on the
+-- document, which the trigram index answers without a sequential scan.
+
+create extension if not exists pg_trgm;
+
+create or replace function lead_search_document(first_name text, last_name text, company text, email text)
+returns text
+language sql
+immutable
+parallel safe
+as $$
+  select lower(concat_ws(' ', first_name, last_name, company, email));
+$$;
+
+create index if not exists leads_search_trgm_idx
+  on leads using gin (lead_search_document(first_name, last_name, company, email) gin_trgm_ops);
+
+create or replace function search_leads(
+  p_owner_email text,
+  p_query text,
+  p_status text default null,
+  p_limit integer default 100,
+  p_offset integer default 0
+)
+returns setof leads
+language plpgsql
+stable
+as $$
+declare
+  v_doc constant text := 'lead_search_document(l.first_name, l.last_name, l.company, l.email)';
+  v_where text := '';
+  v_token text;
+begin
+  foreach v_token in array regexp_split_to_array(lower(trim(p_query)), '\s+') loop
+    continue when v_token = '';
+    -- Escape LIKE wildcards so user input is matched literally
+    v_token := replace(replace(replace(v_token, '\', '\\'), '%', '\%'), '_', '\_');
+    v_where := v_where || format(' and %s like %L', v_doc, '%' || v_token || '%');
+  end loop;
+
+  return query execute format(
+    'select l.* from leads l
+      where l.owner_email = $1
+        and ($2::text is null or l.status = $2) %s
+      order by word_similarity($3, %s) desc, l.created desc, l.id desc
+      limit $4 offset $5',
+    v_where, v_doc
+  )
+  using p_owner_email, p_status, lower(trim(p_query)), p_limit, p_offset;
+end;
+$$;
@@ -0,0 +1,185 @@
+-- backend/sql/report_rollups.sql
+-- Counters behind /reports/deals-by-stage and /reports/conversion-rate.
+-- Statement-level triggers with transition tables keep them current, so a
+-- multi-row insert (CSV import, sync, bulk endpoints) costs one counter
+-- update per statement rather than per row. Reads are a primary-key lookup.
+--
+-- Metrics:
+--   leads_total              dim ''
+--   deals_total              dim ''
+--   deals_won                dim ''       (stage = 'won')
+--   deals_by_stage           dim <stage>
+
+create table if not exists report_rollups (
+  metric text not null,
+  dim text not null default '',
+  value bigint not null default 0,
+  updated_at timestamptz not null default now(),
+  primary key (metric, dim)
+);
+
+create or replace function report_rollups_apply(p_metric text, p_dim text, p_delta bigint)
+returns void
+language sql
+as $$
+  insert into report_rollups (metric, dim, value)
+  values (p_metric, coalesce(p_dim, ''), p_delta)
+  on conflict (metric, dim)
+  do update set value = report_rollups.value + excluded.value, updated_at = now();
+$$;
+
+-- ----------------------------
+-- deals
+-- ----------------------------
+-- One function per event: a statement trigger only sees the transition
+-- tables declared for its own event.
+create or replace function deals_rollups_insert() returns trigger language plpgsql as $$
+begin
+  perform report_rollups_apply('deals_total', '', (select count(*) from new_rows));
+  perform report_rollups_apply('deals_by_stage', s.stage, s.n)
+  from (select coalesce(stage, '') as stage, count(*) as n from new_rows group by 1) s;
+  perform report_rollups_apply('deals_won', '', (select count(*) from new_rows where stage = 'won'));
+  return null;
+end;
+$$;
+
+create or replace function deals_rollups_delete() returns trigger language plpgsql as $$
+begin
+  perform report_rollups_apply('deals_total', '', -(select count(*) from old_rows));
+  perform report_rollups_apply('deals_by_stage', s.stage, -s.n)
+  from (select coalesce(stage, '') as stage, count(*) as n from old_rows group by 1) s;
+  perform report_rollups_apply('deals_won', '', -(select count(*) from old_rows where stage = 'won'));
+  return null;
+end;
+$$;
+
+create or replace function deals_rollups_update() returns trigger language plpgsql as $$
+begin
+  perform report_rollups_apply('deals_by_stage', s.stage, s.n)
+  from (
+    select stage, sum(n) as n
+    from (
+      select coalesce(stage, '') as stage, 1 as n from new_rows
+      union all
+      select coalesce(stage, '') as stage, -1 as n from old_rows
+    ) d
+    group by stage
+    having sum(n) <> 0
+  ) s;
+  perform report_rollups_apply('deals_won', '',
+    (select count(*) from new_rows where stage = 'won') - (select count(*) from old_rows where stage = 'won'));
+  return null;
+end;
+$$;
+
+create or replace function deals_rollups_truncate() returns trigger language plpgsql as $$
+begin
+  delete from report_rollups where metric in ('deals_total', 'deals_won', 'deals_by_stage');
+  return null;
+end;
+$$;
+
+drop trigger if exists deals_rollups_ins on deals;
+create trigger deals_rollups_ins after insert on deals
+  referencing new table as new_rows
+  for each statement execute function deals_rollups_insert();
+
+drop trigger if exists deals_rollups_upd on deals;
+create trigger deals_rollups_upd after update on deals
+  referencing old table as old_rows new table as new_rows
+  for each statement execute function deals_rollups_update();
+
+drop trigger if exists deals_rollups_del on deals;
+create trigger deals_rollups_del after delete on deals
+  referencing old table as old_rows
+  for each statement execute function deals_rollups_delete();
+
+drop trigger if exists deals_rollups_trunc on deals;
+create trigger deals_rollups_trunc after truncate on deals
+  for each statement execute function deals_rollups_truncate();
+
+-- ----------------------------
+-- leads
+-- ----------------------------
+create or replace function leads_rollups_insert() returns trigger language plpgsql as $$
+begin
+  perform report_rollups_apply('leads_total', '', (select count(*) from new_rows));
+  return null;
+end;
+$$;
+
+create or replace function leads_rollups_delete() returns trigger language plpgsql as $$
+begin
+  perform report_rollups_apply('leads_total', '', -(select count(*) from old_rows));
+  return null;
+end;
+$$;
+
+create or replace function leads_rollups_truncate() returns trigger language plpgsql as $$
+begin
+  delete from report_rollups where metric = 'leads_total';
+  return null;
+end;
+$$;
+
+drop trigger if exists leads_rollups_ins on leads;
+create trigger leads_rollups_ins after insert on leads
+  referencing new table as new_rows
+  for each statement execute function leads_rollups_insert();
+
+drop trigger if exists leads_rollups_del on leads;
+create trigger leads_rollups_del after delete on leads
+  referencing old table as old_rows
+  for each statement execute function leads_rollups_delete();
+
+drop trigger if exists leads_rollups_trunc on leads;
+create trigger leads_rollups_trunc after truncate on leads
+  for each statement execute function leads_rollups_truncate();
+
+-- ----------------------------
+-- Rebuild / drift check
+-- ----------------------------
+-- Recomputes every counter from the base tables and returns the rows whose
+-- stored value differed. With p_apply = false it only reports the drift.
+create or replace function rebuild_report_rollups(p_apply boolean default true)
+returns table (metric text, dim text, stored bigint, actual bigint)
+language plpgsql
+as $$
+#variable_conflict use_column
+begin
+  -- Block concurrent writers so the recount and the swap see the same data
+  if p_apply then
+    lock table leads, deals in share row exclusive mode;
+  end if;
+
+  create temp table _rollups_actual on commit drop as
+    select 'leads_total'::text as metric, ''::text as dim, count(*)::bigint as value from leads
+    union all
+    select 'deals_total', '', count(*) from deals
+    union all
+    select 'deals_won', '', count(*) filter (where stage = 'won') from deals
+    union all
+    select 'deals_by_stage', coalesce(stage, ''), count(*) from deals group by 2;
+
+  return query
+    select
+      coalesce(a.metric, s.metric),
+      coalesce(a.dim, s.dim),
+      coalesce(s.value, 0),
+      coalesce(a.value, 0)
+    from _rollups_actual a
+    full join report_rollups s on s.metric = a.metric and s.dim = a.dim
+    where coalesce(s.value, 0) <> coalesce(a.value, 0);
+
+  if p_apply then
+    delete from report_rollups;
+    insert into report_rollups (metric, dim, value)
+      select a.metric, a.dim, a.value from _rollups_actual a;
+  end if;
+
+  drop table _rollups_actual;
+end;
+$$;
+
+-- Seed the counters for existing data
+select * from rebuild_report_rollups(true);
@@ -0,0 +1,172 @@
+-- backend/sql/sqlite_schema.sql
+-- Schema for the embedded SQLite backend (DATA_BACKEND=sqlite), applied on
+-- startup by app/services/sqlite_backend.py. Mirrors the Supabase tables
+-- the routes use. Columns declared TIMESTAMPTZ hold ISO-8601 UTC text; the
+-- backend normalizes values written to and compared against them so they
+-- sort like Postgres timestamps.
+
+create table if not exists users (
+  id integer primary key autoincrement,
+  email text not null unique,
+  password text,
+  role text default 'Sales',
+  name text,
+  profile_pic text,
+  created_at timestamptz not null default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+
+create table if not exists leads (
+  id integer primary key autoincrement,
+  first_name text,
+  last_name text,
+  company text,
+  email text,
+  phone text,
+  source text,
+  status text,
+  notes text,
+  created timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')),
+  owner_email text,
+  external_source text,
+  external_id integer
+);
+
+create table if not exists contacts (
+  id integer primary key autoincrement,
+  first_name text,
+  last_name text,
+  email text,
+  phone text,
+  company text,
+  job_title text,
+  notes text,
+  created timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')),
+  owner_email text
+);
+
+create table if not exists deals (
+  id integer primary key autoincrement,
+  title text,
+  company text,
+  value real default 0,
+  stage text default 'new',
+  lead_id integer,
+  owner_id integer,
+  close_date date,
+  notes text,
+  created_at timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')),
+  updated_at timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+
+create table if not exists activities (
+  id integer primary key autoincrement,
+  user_email text,
+  type text,
+  message text,
+  amount real,
+  created_at timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+
+create table if not exists campaigns (
+  id integer primary key autoincrement,
+  title text,
+  description text,
+  created_by text,
+  status text,
+  created_at timestamptz default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+
+create table if not exists external_leads (
+  id integer primary key autoincrement,
+  first_name text,
+  last_name text,
+  company text,
+  updated_at timestamptz not null default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now'))
+);
+
+create table if not exists sync_watermarks (
+  source text not null,
+  owner_email text not null,
+  last_updated_at timestamptz,
+  last_id integer,
+  synced_at timestamptz not null default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')),
+  primary key (source, owner_email)
+);
+
+-- ----------------------------
+-- Indexes (same shapes as keyset_indexes.sql, dashboard_kpis.sql, external_sync.sql)
+-- ----------------------------
+create index if not exists leads_owner_created_id_idx on leads (owner_email, created desc, id desc);
+create index if not exists leads_owner_id_idx on leads (owner_email, id);
+create index if not exists leads_owner_email_status_idx on leads (owner_email, status);
+create unique index if not exists leads_external_key_idx on leads (owner_email, external_source, external_id);
+create index if not exists contacts_owner_created_id_idx on contacts (owner_email, created desc, id desc);
+create index if not exists contacts_owner_id_idx on contacts (owner_email, id);
+create index if not exists deals_owner_created_id_idx on deals (owner_id, created_at desc, id desc);
+create index if not exists deals_owner_id_id_idx on deals (owner_id, id);
+create index if not exists deals_owner_id_stage_idx on deals (owner_id, stage);
+create index if not exists deals_owner_close_date_idx on deals (owner_id, close_date);
+create index if not exists deals_stage_close_date_idx on deals (stage, close_date);
+create index if not exists activities_user_created_idx on activities (user_email, created_at desc);
+create index if not exists external_leads_updated_id_idx on external_leads (updated_at, id);
+
+-- ----------------------------
+-- Report rollups (row-level equivalents of report_rollups.sql)
+-- ----------------------------
+create table if not exists report_rollups (
+  metric text not null,
+  dim text not null default '',
+  value integer not null default 0,
+  updated_at timestamptz not null default (strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')),
+  primary key (metric, dim)
+);
+
+create trigger if not exists deals_rollups_ins after insert on deals
+begin
+  insert into report_rollups (metric, dim, value) values
+    ('deals_total', '', 1),
+    ('deals_by_stage', coalesce(new.stage, ''), 1),
+    ('deals_won', '', coalesce(new.stage, '') = 'won')
+  on conflict (metric, dim) do update set
+    value = value + excluded.value,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now');
+end;
+
+create trigger if not exists deals_rollups_del after delete on deals
+begin
+  insert into report_rollups (metric, dim, value) values
+    ('deals_total', '', -1),
+    ('deals_by_stage', coalesce(old.stage, ''), -1),
+    ('deals_won', '', -(coalesce(old.stage, '') = 'won'))
+  on conflict (metric, dim) do update set
+    value = value + excluded.value,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now');
+end;
+
+create trigger if not exists deals_rollups_upd after update of stage on deals
+when coalesce(old.stage, '') <> coalesce(new.stage, '')
+begin
+  insert into report_rollups (metric, dim, value) values
+    ('deals_by_stage', coalesce(old.stage, ''), -1),
+    ('deals_by_stage', coalesce(new.stage, ''), 1),
+    ('deals_won', '', (coalesce(new.stage, '') = 'won') - (coalesce(old.stage, '') = 'won'))
+  on conflict (metric, dim) do update set
+    value = value + excluded.value,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now');
+end;
+
+create trigger if not exists leads_rollups_ins after insert on leads
+begin
+  insert into report_rollups (metric, dim, value) values ('leads_total', '', 1)
+  on conflict (metric, dim) do update set
+    value = value + 1,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now');
+end;
+
+create trigger if not exists leads_rollups_del after delete on leads
+begin
+  insert into report_rollups (metric, dim, value) values ('leads_total', '', -1)
+  on conflict (metric, dim) do update set
+    value = value - 1,
+    updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now');
+end;
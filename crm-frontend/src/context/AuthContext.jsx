@@ -13,13 +13,22 @@ export function AuthProvider({ children }) {
       localStorage.setItem("authToken", token);
 
       const decoded = jwtDecode(token);
+      const identity = { email: decoded.sub, role: decoded.role };
+      setUser(identity);
 
-      setUser({
-        name: decoded.name,
-        email: decoded.sub,
-        role: decoded.role,
-        profilePic: decoded.profile_pic
-      });
+      // Name and picture can change under a live token, so they are not in it
+      fetch("http://127.0.0.1:8000/auth/me", {
+        headers: {
+          Authorization: `Bearer ${token}`,
+        },
+      })
+        .then((res) => (res.ok ? res.json() : null))
+        .then((data) => {
+          if (data) {
+            setUser({ ...identity, name: data.name, profilePic: data.profile_pic });
+          }
+        })
+        .catch((error) => console.error("Failed to load profile", error));
     } else {
       localStorage.removeItem("authToken");
       setUser(null);
@@ -32,10 +41,8 @@ export function AuthProvider({ children }) {
   const decoded = jwtDecode(newToken);
 
     setUser({
-      name: decoded.name,
       email: decoded.sub,
-      role: decoded.role,
-      profilePic: decoded.profile_pic
+      role: decoded.role
   });
 
   navigate("/dashboard");